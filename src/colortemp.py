@@ -0,0 +1,75 @@
+"""
+Color temperature -> RGB ramp multipliers.
+
+The multipliers come from the chromaticity of a blackbody radiator (Planckian locus,
+Kim et al. cubic approximation) converted to linear sRGB, relative to 6500 K and scaled so
+the strongest channel is 1.0 (the filter never boosts), then sRGB-encoded because the
+multipliers scale the (already encoded) ramp output. The table is computed once at import;
+a slider tick is a linear interpolation between two entries.
+"""
+
+MIN_KELVIN = 1700
+MAX_KELVIN = 25000
+STEP_KELVIN = 50
+NEUTRAL_KELVIN = 6500
+
+# Range of the Kelvin slider in the GUI
+SLIDER_MIN = 1700
+SLIDER_MAX = 10000
+SLIDER_STEP = 100
+
+COLOR_MODES = ("rgb", "temperature")
+
+
+def _planckian_xy(kelvin):
+    """CIE 1931 xy chromaticity of a blackbody at the given temperature (1667 K - 25000 K)."""
+    t = float(kelvin)
+    if t <= 4000:
+        x = -0.2661239e9 / t**3 - 0.2343589e6 / t**2 + 0.8776956e3 / t + 0.179910
+    else:
+        x = -3.0258469e9 / t**3 + 2.1070379e6 / t**2 + 0.2226347e3 / t + 0.240390
+
+    if t <= 2222:
+        y = -1.1063814 * x**3 - 1.34811020 * x**2 + 2.18555832 * x - 0.20219683
+    elif t <= 4000:
+        y = -0.9549476 * x**3 - 1.37418593 * x**2 + 2.09137015 * x - 0.16748867
+    else:
+        y = 3.0817580 * x**3 - 5.87338670 * x**2 + 3.75112997 * x - 0.37001483
+    return x, y
+
+
+def _linear_rgb(kelvin):
+    """Linear sRGB of the blackbody white point (Y = 1), negative (out of gamut) clipped to 0."""
+    x, y = _planckian_xy(kelvin)
+    X, Y, Z = x / y, 1.0, (1.0 - x - y) / y
+    r = 3.2404542 * X - 1.5371385 * Y - 0.4985314 * Z
+    g = -0.9692660 * X + 1.8760108 * Y + 0.0415560 * Z
+    b = 0.0556434 * X - 0.2040259 * Y + 1.0572252 * Z
+    return max(0.0, r), max(0.0, g), max(0.0, b)
+
+
+def _srgb_encode(c):
+    return 12.92 * c if c <= 0.0031308 else 1.055 * c ** (1 / 2.4) - 0.055
+
+
+def _build_table():
+    ref = _linear_rgb(NEUTRAL_KELVIN)
+    table = []
+    for kelvin in range(MIN_KELVIN, MAX_KELVIN + 1, STEP_KELVIN):
+        rel = [c / r for c, r in zip(_linear_rgb(kelvin), ref)]
+        peak = max(rel)
+        table.append(tuple(_srgb_encode(c / peak) for c in rel))
+    return table
+
+
+WHITE_POINTS = _build_table()
+
+
+def temperature_scales(kelvin):
+    """(r_scale, g_scale, b_scale) for a color temperature, interpolated from WHITE_POINTS."""
+    pos = (min(MAX_KELVIN, max(MIN_KELVIN, kelvin)) - MIN_KELVIN) / STEP_KELVIN
+    i = min(int(pos), len(WHITE_POINTS) - 2)
+    f = pos - i
+    r0, g0, b0 = WHITE_POINTS[i]
+    r1, g1, b1 = WHITE_POINTS[i + 1]
+    return (r0 + (r1 - r0) * f, g0 + (g1 - g0) * f, b0 + (b1 - b0) * f)
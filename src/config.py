@@ -3,17 +3,89 @@ import os
 import winreg
 import sys
 import shutil
+import itertools
+import threading
+from types import MappingProxyType
 from .utils import get_app_dir
+from .preset_index import PresetIndex
+from .ramp import ramp_params, ramp_table
+from .diagnostics import diag
 
 APP_RUN_KEY = r"Software\Microsoft\Windows\CurrentVersion\Run"
 APP_RUN_NAME = "NVFT"
 
+# Settings that feed the gamma ramp
+RAMP_KEYS = ("brightness", "contrast", "gamma", "red_scale", "green_scale", "blue_scale", "color_mode", "temperature", "custom_ramp")
+
+def _file_signature(path):
+    """Cheap change check: (mtime_ns, size) of a file, or None if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+# Version numbers for snapshots; shared by all managers so they never collide
+_versions = itertools.count(1)
+
+
+class SettingsSnapshot:
+    """
+    Immutable view of the settings at one point in time.
+    Writers build a new snapshot and swap the reference, so a reader that grabbed one always
+    sees a consistent set of values without taking a lock.
+
+    version:      bumped on every change
+    ramp:         precomputed ramp_params() for these values
+    table:        ready-made RAMP from custom_ramp (imported LUT), which replaces the parametric ramp
+    ramp_version: only bumped when a RAMP_KEYS value changed (tells the ramp pipeline to recompute)
+    """
+    __slots__ = ("version", "values", "ramp", "table", "ramp_version")
+
+    def __init__(self, values, previous=None):
+        values = dict(values)
+        object.__setattr__(self, "version", next(_versions))
+        object.__setattr__(self, "values", MappingProxyType(values))
+        if previous is not None and all(previous.values.get(k) == values.get(k) for k in RAMP_KEYS):
+            object.__setattr__(self, "ramp", previous.ramp)
+            object.__setattr__(self, "table", previous.table)
+            object.__setattr__(self, "ramp_version", previous.ramp_version)
+        else:
+            object.__setattr__(self, "ramp", ramp_params(values))
+            object.__setattr__(self, "table", ramp_table(values))
+            object.__setattr__(self, "ramp_version", self.version)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SettingsSnapshot is immutable")
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __contains__(self, key):
+        return key in self.values
+
+    def with_changes(self, changes):
+        """New snapshot with the given key/value changes applied (self if nothing changed)."""
+        if all(k in self.values and self.values[k] == v for k, v in changes.items()):
+            return self
+        values = dict(self.values)
+        values.update(changes)
+        return SettingsSnapshot(values, self)
+
+
 class ConfigManager:
-    def __init__(self):
+    def __init__(self, load=True):
         # Use LocalAppData for persistence
         self.app_dir = os.path.join(os.environ["LOCALAPPDATA"], "NVFT")
         if not os.path.exists(self.app_dir):
             os.makedirs(self.app_dir)
+        # Logs and profiles get their own folder: ConfigWatcher watches app_dir (not recursively)
+        # and every log write there would wake it
+        self.logs_dir = os.path.join(self.app_dir, "logs")
+        os.makedirs(self.logs_dir, exist_ok=True)
 
         self.config_file = os.path.join(self.app_dir, "settings.json")
         self.presets_file = os.path.join(self.app_dir, "presets.json")
@@ -25,22 +97,39 @@ class ConfigManager:
             "red_scale": 1.0,
             "green_scale": 1.0,
             "blue_scale": 1.0,
+            "color_mode": "rgb",
+            "temperature": 6500,
+            "custom_ramp": None,
             "hotkey": "ctrl+f10",
             "autostart": False,
-            "always_on_top": True
+            "always_on_top": True,
+            "palette_hotkey": None,
+            "hold_hotkey": None,
+            "debounce_ms": 150,
+            "schedule": [],
+            "playlist": [],
+            "cycle_next_hotkey": None,
+            "cycle_prev_hotkey": None
         }
         
-        self.current_settings = self.default_settings.copy()
+        self._snapshot = SettingsSnapshot(self.default_settings)
+        # Serializes writers only; readers just take the current snapshot reference
+        self._write_lock = threading.Lock()
         self.presets = {}
+        self.preset_index = PresetIndex()
+        # Last seen (mtime, size) of each file, used to skip reloads of our own writes
+        self._signatures = {}
         
-        # Migrate if needed
-        self._migrate_old_config()
-        
-        self.load_settings()
-        self.load_presets()
-        
-        # Sync autostart status with registry
-        self.sync_autostart_registry()
+        # With load=False the caller runs the steps below itself (see main: parallel startup)
+        if load:
+            # Migrate if needed
+            self._migrate_old_config()
+            
+            self.load_settings()
+            self.load_presets()
+            
+            # Sync autostart status with registry
+            self.sync_autostart_registry()
 
     def _migrate_old_config(self):
         """Migrate settings from old executable directory if they exist and new ones don't."""
@@ -52,13 +141,13 @@ class ConfigManager:
             try:
                 shutil.copy2(old_settings, self.config_file)
             except Exception as e:
-                print(f"Failed to migrate settings: {e}")
+                diag.error("config", "Failed to migrate settings", error=e)
                 
         if not os.path.exists(self.presets_file) and os.path.exists(old_presets):
             try:
                 shutil.copy2(old_presets, self.presets_file)
             except Exception as e:
-                print(f"Failed to migrate presets: {e}")
+                diag.error("config", "Failed to migrate presets", error=e)
 
     def load_settings(self):
         if os.path.exists(self.config_file):
@@ -66,50 +155,124 @@ class ConfigManager:
                 with open(self.config_file, 'r') as f:
                     data = json.load(f)
                     # Update curr settings with loaded data, keeping defaults for missing keys
-                    self.current_settings.update(data)
+                    self.update_settings(data)
+                self._signatures[self.config_file] = _file_signature(self.config_file)
             except Exception as e:
-                print(f"Error loading settings: {e}")
+                diag.error("config", "Error loading settings", error=e)
         else:
             self.save_settings()
 
     def save_settings(self):
         try:
             with open(self.config_file, 'w') as f:
-                json.dump(self.current_settings, f, indent=4)
+                json.dump(dict(self._snapshot.values), f, indent=4)
+            self._signatures[self.config_file] = _file_signature(self.config_file)
         except Exception as e:
-            print(f"Error saving settings: {e}")
+            diag.error("config", "Error saving settings", error=e)
+
+    @property
+    def snapshot(self):
+        """The current SettingsSnapshot (safe to read from any thread)."""
+        return self._snapshot
+
+    @property
+    def current_settings(self):
+        """Read-only mapping of the current settings; change them with update_setting(s)."""
+        return self._snapshot.values
 
     def update_setting(self, key, value):
-        self.current_settings[key] = value
+        return self.update_settings({key: value})
+
+    def update_settings(self, changes):
+        """
+        Copy-on-write update: publishes a new snapshot and returns it.
+        Changing any other ramp setting drops a stored custom_ramp (it would hide the change).
+        """
+        if "custom_ramp" not in changes and self._snapshot.values.get("custom_ramp") and not set(changes).isdisjoint(RAMP_KEYS):
+            changes = dict(changes, custom_ramp=None)
+        with self._write_lock:
+            self._snapshot = self._snapshot.with_changes(changes)
+            return self._snapshot
 
     def load_presets(self):
         if os.path.exists(self.presets_file):
             try:
                 with open(self.presets_file, 'r') as f:
                     self.presets = json.load(f)
+                self._signatures[self.presets_file] = _file_signature(self.presets_file)
             except Exception as e:
-                print(f"Error loading presets: {e}")
+                diag.error("config", "Error loading presets", error=e)
                 self.presets = {}
         else:
             self.presets = {}
+        self.preset_index = PresetIndex(self.presets)
 
     def save_presets(self):
         try:
             with open(self.presets_file, 'w') as f:
                 json.dump(self.presets, f, indent=4)
+            self._signatures[self.presets_file] = _file_signature(self.presets_file)
         except Exception as e:
-            print(f"Error saving presets: {e}")
+            diag.error("config", "Error saving presets", error=e)
+
+    # --- Hot Reload ---
+
+    def _file_changed(self, path):
+        return _file_signature(path) != self._signatures.get(path)
+
+    def _read_json(self, path):
+        """Parse a config file for reloading. Returns None if missing or half-written."""
+        signature = _file_signature(path)
+        if signature is None:
+            return None
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            # Most likely a deployment script is still writing; the next notification retries
+            diag.warning("config", "Error reloading file", file=os.path.basename(path), error=e)
+            return None
+        self._signatures[path] = signature
+        return data
+
+    def reload_changed(self):
+        """
+        Re-read settings.json / presets.json if they changed on disk since our last load or save.
+        Returns (changed setting keys, changed preset names); both empty if nothing changed.
+        """
+        changed_keys = set()
+        changed_presets = set()
+
+        if self._file_changed(self.config_file):
+            data = self._read_json(self.config_file)
+            if isinstance(data, dict):
+                current = self._snapshot.values
+                changes = {k: v for k, v in data.items() if current.get(k) != v}
+                if changes:
+                    self.update_settings(changes)
+                    changed_keys.update(changes)
+
+        if self._file_changed(self.presets_file):
+            data = self._read_json(self.presets_file)
+            if isinstance(data, dict):
+                for name in set(self.presets) | set(data):
+                    if self.presets.get(name) != data.get(name):
+                        changed_presets.add(name)
+                        if name not in data:
+                            self.preset_index.remove(name)
+                        elif name not in self.presets:
+                            self.preset_index.add(name)
+                self.presets = data
+
+        return changed_keys, changed_presets
 
     def save_preset(self, name, current_values):
         """Save current active values as a preset"""
-        preset_data = current_values.copy()
-        
-        # Remove 'hotkey' from the copy, because 'current_values' normally includes the GLOBAL hotkey
-        # We don't want the global hotkey to become the preset hotkey by default.
-        for key in ["hotkey", "autostart", "always_on_top"]:
-            if key in preset_data:
-                del preset_data[key]
-        
+        # Only the ramp settings: app-wide settings (hotkeys, schedule, playlist, ...) never become
+        # part of a preset, including ones added later
+        preset_data = {key: current_values[key] for key in RAMP_KEYS if key in current_values}
+
+        # The preset's own hotkey, not the global one from current_values.
         # Preserve existing hotkey if updating an existing preset
         old_data = self.presets.get(name)
         if isinstance(old_data, dict) and "hotkey" in old_data:
@@ -118,11 +281,13 @@ class ConfigManager:
             preset_data["hotkey"] = None
         
         self.presets[name] = preset_data
+        self.preset_index.add(name)
         self.save_presets()
 
     def delete_preset(self, name):
         if name in self.presets:
             del self.presets[name]
+            self.preset_index.remove(name)
             self.save_presets()
             return True
         return False
@@ -130,61 +295,73 @@ class ConfigManager:
     def rename_preset(self, old_name, new_name):
         if old_name in self.presets and new_name not in self.presets:
             self.presets[new_name] = self.presets.pop(old_name)
+            self.preset_index.rename(old_name, new_name)
             self.save_presets()
+            playlist = self._snapshot.get("playlist") or []
+            if old_name in playlist:
+                self.update_setting("playlist", [new_name if n == old_name else n for n in playlist])
+                self.save_settings()
             return True
         return False
 
-    def get_preset_names(self):
-        return sorted(self.presets.keys())
+    def get_preset_names(self, limit=None):
+        return self.preset_index.names(limit)
+
+    def search_presets(self, query, limit=8):
+        return self.preset_index.search(query, limit)
+
+    def playlist(self):
+        """Preset names of the "playlist" setting (cycling order), skipping missing ones and repeats."""
+        return [n for n in dict.fromkeys(self._snapshot.get("playlist") or []) if n in self.presets]
+
+    def set_in_playlist(self, name, included):
+        """Append a preset to the playlist or remove it."""
+        playlist = [n for n in self._snapshot.get("playlist") or [] if n != name]
+        if included:
+            playlist.append(name)
+        self.update_setting("playlist", playlist)
+        self.save_settings()
 
     # --- Autostart / Registry Logic ---
 
     def sync_autostart_registry(self):
         enabled = self.current_settings.get("autostart", False)
+        # Skip the registry write when the Run key already says what we want
+        if self._read_autostart_value() == (self._autostart_command() if enabled else None):
+            return
         self.set_autostart(enabled)
 
-    def set_autostart(self, enabled: bool):
-        exe_path = sys.executable
-        # If running as script, use python.exe, but we really want the script path for persistence?
-        # Actually for scripts standard practice is hard. Assuming compiled exe for end users via PyInstaller
-        # If frozen, sys.executable is the app.exe
-        
+    def _autostart_command(self):
+        # Windows Run Key expects simple path or "Path" "Args"
         if getattr(sys, 'frozen', False):
-             target = sys.executable
-        else:
-            # If running as script, we can't easily auto-start without a bat file or similar.
-            # We will point to pythonw.exe + script path
-            # But arguments in Run key are tricky.
-            # For this context, we will point to the python executable and assume the user knows
-            # or best effort:
-            target = f'"{sys.executable}" "{os.path.abspath(sys.argv[0])}"'
-            
-            # NOTE: For development, this might not work perfectly if dependencies are not found 
-            # but we fixed the CWD issue in get_app_dir so it might work.
-            
-            # However, simpler to just point to the entry script if possible.
-            # Let's fallback to current behavior but robust
-            pass
+            # If frozen, sys.executable is the app.exe
+            return f'"{sys.executable}"'
+        # If we are in dev mode (not frozen), we construct a command
+        # e.g. "C:\Python\pythonw.exe" "C:\Apps\NVFT\src\main.py"
+        # NOTE: For development, this might not work perfectly if dependencies are not found
+        # but we fixed the CWD issue in get_app_dir so it might work.
+        script_path = os.path.join(get_app_dir(), "src", "main.py")
+        return f'"{sys.executable.replace("python.exe", "pythonw.exe")}" "{script_path}"'
 
-        # Windows Run Key expects simple path or "Path" "Args"
-        # We will use the proper path derived above.
-        
+    def _read_autostart_value(self):
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, APP_RUN_KEY, 0, winreg.KEY_READ) as key:
+                value, _ = winreg.QueryValueEx(key, APP_RUN_NAME)
+                return value
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            diag.error("config", "Error reading autostart registry value", error=e)
+            return None
+
+    def set_autostart(self, enabled: bool):
         try:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, APP_RUN_KEY, 0, winreg.KEY_ALL_ACCESS)
         except FileNotFoundError:
             key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, APP_RUN_KEY)
 
         if enabled:
-            # If we are in dev mode (not frozen), we construct a command
-            if not getattr(sys, 'frozen', False):
-                 # e.g. "C:\Python\pythonw.exe" "C:\Apps\NVFT\src\main.py"
-                 # We need to ensure we run main.py
-                 script_path = os.path.join(get_app_dir(), "src", "main.py")
-                 cmd = f'"{sys.executable.replace("python.exe", "pythonw.exe")}" "{script_path}"'
-            else:
-                cmd = f'"{sys.executable}"'
-
-            winreg.SetValueEx(key, APP_RUN_NAME, 0, winreg.REG_SZ, cmd)
+            winreg.SetValueEx(key, APP_RUN_NAME, 0, winreg.REG_SZ, self._autostart_command())
         else:
             try:
                 winreg.DeleteValue(key, APP_RUN_NAME)
@@ -192,4 +369,3 @@ class ConfigManager:
                 pass
 
         winreg.CloseKey(key)
-
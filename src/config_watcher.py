@@ -0,0 +1,61 @@
+import ctypes
+import threading
+from ctypes import windll
+from .metrics import meter
+from .diagnostics import diag
+
+# Windows change notification API
+FILE_NOTIFY_CHANGE_FILE_NAME = 0x00000001
+FILE_NOTIFY_CHANGE_SIZE = 0x00000008
+FILE_NOTIFY_CHANGE_LAST_WRITE = 0x00000010
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+INFINITE = 0xFFFFFFFF
+WAIT_OBJECT_0 = 0
+
+kernel32 = windll.kernel32
+kernel32.FindFirstChangeNotificationW.argtypes = [ctypes.c_wchar_p, ctypes.c_int, ctypes.c_uint32]
+kernel32.FindFirstChangeNotificationW.restype = ctypes.c_void_p
+kernel32.FindNextChangeNotification.argtypes = [ctypes.c_void_p]
+kernel32.FindCloseChangeNotification.argtypes = [ctypes.c_void_p]
+kernel32.WaitForSingleObject.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+kernel32.WaitForSingleObject.restype = ctypes.c_uint32
+
+
+class ConfigWatcher:
+    """
+    Watches the config directory with OS change notifications.
+    The thread sleeps in the kernel until something in the directory is written;
+    deciding what actually changed is left to ConfigManager.reload_changed (mtime/size check).
+    """
+    def __init__(self, directory, on_change):
+        self.directory = directory
+        self.on_change = on_change
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._worker, daemon=True, name="NVFT-watcher")
+        self._thread.start()
+
+    def _worker(self):
+        handle = kernel32.FindFirstChangeNotificationW(
+            self.directory,
+            False,
+            FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_SIZE | FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+        if not handle or handle == INVALID_HANDLE_VALUE:
+            diag.warning("watcher", "Config watcher unavailable, hot reload disabled", directory=self.directory)
+            return
+
+        try:
+            while True:
+                if kernel32.WaitForSingleObject(handle, INFINITE) != WAIT_OBJECT_0:
+                    break
+                meter.wakeup("watcher")
+                try:
+                    self.on_change()
+                except Exception as e:
+                    diag.error("watcher", "Config watcher error", error=e)
+                if not kernel32.FindNextChangeNotification(handle):
+                    break
+        finally:
+            kernel32.FindCloseChangeNotification(handle)
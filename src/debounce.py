@@ -0,0 +1,60 @@
+import math
+import threading
+import time
+
+DEFAULT_WINDOW_MS = 150
+
+
+class Debouncer:
+    """
+    Drops repeats of the same action (toggle, preset load, ...) that arrive within a short
+    window, whichever source they come from: hotkeys and IPC share the window, so a Stream
+    Deck press right after the hotkey is dropped too. Suppressed events are counted per
+    source and reason for the stats/status commands.
+    """
+    def __init__(self, window_ms=DEFAULT_WINDOW_MS):
+        self.window = window_ms / 1000.0
+        self._last = {}
+        self._suppressed = {}
+        self._lock = threading.Lock()
+
+    def configure(self, window_ms):
+        """Set the window from the debounce_ms setting; invalid values (hand-edited settings.json) keep the default."""
+        if window_ms is None:
+            window_ms = DEFAULT_WINDOW_MS
+        try:
+            value = float(window_ms)
+            if not math.isfinite(value):
+                raise ValueError("not finite")
+        except (TypeError, ValueError) as e:
+            # Imported here: diagnostics -> metrics -> debounce would be circular at module level
+            from .diagnostics import diag
+            diag.warning("debounce", "Invalid debounce_ms, using the default", value=str(window_ms), default=DEFAULT_WINDOW_MS, error=e)
+            value = DEFAULT_WINDOW_MS
+        self.window = max(0.0, value) / 1000.0
+
+    def allow(self, action, source):
+        """True if the action should run; False (and counted) if it repeats within the window."""
+        now = time.monotonic()
+        with self._lock:
+            last = self._last.get(action)
+            if last is not None and now - last < self.window:
+                self._count(f"{source}.debounce")
+                return False
+            self._last[action] = now
+            return True
+
+    def suppress(self, source, reason):
+        """Count an event dropped before reaching allow() (e.g. key autorepeat)."""
+        with self._lock:
+            self._count(f"{source}.{reason}")
+
+    def _count(self, key):
+        self._suppressed[key] = self._suppressed.get(key, 0) + 1
+
+    def counts(self):
+        with self._lock:
+            return dict(self._suppressed)
+
+
+debouncer = Debouncer()
@@ -0,0 +1,147 @@
+"""
+Structured diagnostics channel.
+
+Events go into a bounded in-memory ring buffer; logging one is a tuple append (no
+formatting, no I/O), so it is safe on hot paths like the toggle. A background thread
+formats and writes them to a rotating JSON-lines file in the logs folder (and echoes
+them to the console when there is one). It sleeps until a warning or error arrives or
+a dump is requested from the tray or IPC; info events are written along with the next flush.
+"""
+import atexit
+import collections
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from .metrics import meter
+
+RING_CAPACITY = 2000
+LOG_NAME = "diagnostics.log"
+MAX_BYTES = 1024 * 1024
+BACKUPS = 3
+
+
+class Diagnostics:
+    def __init__(self, capacity=RING_CAPACITY):
+        self._ring = collections.deque(maxlen=capacity)
+        self._seq = itertools.count(1)
+        self._written = 0
+        self.path = None
+        self._wake = threading.Event()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def attach(self, directory):
+        """Start writing to <directory>/diagnostics.log (events logged before are kept)."""
+        self.path = os.path.join(directory, LOG_NAME)
+        self._start()
+        self._wake.set()
+
+    # --- Hot path ---
+
+    def log(self, level, component, message, **fields):
+        if level != "info":
+            # Don't keep exceptions (and through them whole stack frames) alive in the ring
+            fields = {k: f"{type(v).__name__}: {v}" if isinstance(v, BaseException) else v for k, v in fields.items()}
+        self._ring.append((next(self._seq), time.time(), level, component, message, fields))
+        if level != "info":
+            self._start()
+            self._wake.set()
+
+    def info(self, component, message, **fields):
+        # Inlined (no log() hop): this is the one called on hot paths
+        self._ring.append((next(self._seq), time.time(), "info", component, message, fields))
+
+    def warning(self, component, message, **fields):
+        self.log("warning", component, message, **fields)
+
+    def error(self, component, message, **fields):
+        self.log("error", component, message, **fields)
+
+    # --- On demand ---
+
+    def recent(self, limit=None):
+        """The buffered events as dicts, oldest first."""
+        events = list(self._ring)
+        if limit is not None:
+            events = events[-limit:] if limit else []
+        return [self._as_dict(e) for e in events]
+
+    def dump(self):
+        """Write everything not written yet, including info events, and return the log path."""
+        self._write_pending(force=True)
+        return self.path
+
+    def flush(self):
+        """Write pending events synchronously (used at exit; without a file they go to the console)."""
+        self._write_pending(force=True)
+
+    # --- Writer ---
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, daemon=True, name="NVFT-diagnostics")
+            self._thread.start()
+
+    def _worker(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            meter.wakeup("diagnostics")
+            try:
+                self._write_pending()
+            except Exception as e:
+                # Last resort: the diagnostics channel itself failed
+                if sys.stderr:
+                    sys.stderr.write(f"Diagnostics writer error: {e}\n")
+
+    def _as_dict(self, event):
+        seq, t, level, component, message, fields = event
+        record = {"t": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(t)) + f".{int(t % 1 * 1000):03d}",
+                  "level": level, "component": component, "msg": message}
+        for k, v in fields.items():
+            record[k] = v if isinstance(v, (int, float, bool, type(None))) else str(v)
+        return record
+
+    def _write_pending(self, force=False):
+        # Until attach() the writer keeps events pending so they still reach the file
+        if self.path is None and not force:
+            return
+        with self._write_lock:
+            events = [e for e in list(self._ring) if e[0] > self._written]
+            if not events:
+                return
+            lines = []
+            dropped = events[0][0] - self._written - 1
+            if dropped > 0:
+                lines.append(json.dumps({"level": "warning", "component": "diagnostics", "msg": f"ring buffer overflow, {dropped} event(s) lost"}))
+            lines.extend(json.dumps(self._as_dict(e)) for e in events)
+            self._written = events[-1][0]
+
+            if sys.stderr:
+                for e, line in zip(events, lines[-len(events):]):
+                    if e[2] != "info":
+                        sys.stderr.write(line + "\n")
+            if self.path:
+                self._rotate(sum(len(line) + 1 for line in lines))
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+
+    def _rotate(self, incoming):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size + incoming <= MAX_BYTES:
+            return
+        for i in range(BACKUPS - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+diag = Diagnostics()
@@ -0,0 +1,191 @@
+"""
+Fit ramp parameters to reference images.
+
+Given pairs of "before" and "desired" screenshots, solves for the brightness, contrast,
+gamma and RGB scale values (the same model as GammaController.apply_settings) that best
+map one to the other, and optionally saves the result as a preset.
+
+    python -m src.fit before.png desired.png [before2.png desired2.png ...] --name "My Monitor"
+
+The images are reduced to per-channel statistics over the 256 input levels first, so the
+optimizer never touches pixels again and each loss evaluation costs ~256 operations.
+"""
+import argparse
+import sys
+
+import numpy as np
+from PIL import Image
+
+from .ramp import RAMP_SIZE
+
+# Parameter order and bounds (same ranges as the sliders)
+PARAM_KEYS = ("brightness", "contrast", "gamma", "red_scale", "green_scale", "blue_scale")
+LOWER = np.array([0.0, 0.0, 0.1, 0.0, 0.0, 0.0])
+UPPER = np.array([1.0, 1.0, 5.0, 2.0, 2.0, 2.0])
+
+GRID_STEPS = 24
+LEVELS = np.arange(RAMP_SIZE, dtype=np.float64) / 255.0
+
+
+class LevelStats:
+    """Per channel and input level: pixel count, sum and sum of squares of the desired value (0..1)."""
+    def __init__(self):
+        self.count = np.zeros((3, RAMP_SIZE))
+        self.total = np.zeros((3, RAMP_SIZE))
+        self.squares = np.zeros((3, RAMP_SIZE))
+
+    def add_pair(self, before, desired):
+        src = np.asarray(before.convert("RGB"), dtype=np.uint8).reshape(-1, 3)
+        dst = np.asarray(desired.convert("RGB"), dtype=np.float64).reshape(-1, 3) / 255.0
+        for k in range(3):
+            levels = src[:, k]
+            self.count[k] += np.bincount(levels, minlength=RAMP_SIZE)
+            self.total[k] += np.bincount(levels, weights=dst[:, k], minlength=RAMP_SIZE)
+            self.squares[k] += np.bincount(levels, weights=dst[:, k] ** 2, minlength=RAMP_SIZE)
+
+    def loss(self, outputs):
+        """
+        Mean squared error of model outputs (..., 3, 256) against all pixels:
+        sum_i n_i * (m_i^2 - 2 m_i mean_i) + sum of squares, divided by pixel count.
+        """
+        err = (self.count * outputs * outputs - 2.0 * self.total * outputs).sum(axis=(-2, -1))
+        return (err + self.squares.sum()) / max(1.0, self.count.sum() / 3.0) / 3.0
+
+
+def base_curves(brightness, contrast, gamma):
+    """Vectorized ramp base curve for arrays of parameters; returns shape (..., 256)."""
+    brightness = np.asarray(brightness, dtype=np.float64)[..., None]
+    contrast = np.asarray(contrast, dtype=np.float64)[..., None]
+    gamma = np.maximum(0.1, np.asarray(gamma, dtype=np.float64))[..., None]
+    val = np.power(LEVELS, 1.0 / gamma)
+    val = (val + (brightness - 0.5) - 0.5) * (contrast * 2.0) + 0.5
+    return np.clip(val, 0.0, 1.0)
+
+
+def model_outputs(params):
+    """Output levels (0..1) per channel for parameter array(s) of shape (..., 6); returns (..., 3, 256)."""
+    params = np.asarray(params, dtype=np.float64)
+    base = base_curves(params[..., 0], params[..., 1], params[..., 2])
+    scales = params[..., 3:6]
+    # The ramp clamps at 65535, i.e. 1.0 after scaling
+    return np.minimum(1.0, base[..., None, :] * scales[..., :, None])
+
+
+def _grid_search(stats):
+    """Coarse search over brightness/contrast/gamma with per-channel scales solved in closed form."""
+    b, c, g = np.meshgrid(
+        np.linspace(0.0, 1.0, GRID_STEPS),
+        np.linspace(0.0, 1.0, GRID_STEPS),
+        np.geomspace(0.2, 5.0, GRID_STEPS),
+        indexing="ij",
+    )
+    b, c, g = b.ravel(), c.ravel(), g.ravel()
+    base = base_curves(b, c, g)  # (N, 256)
+
+    # Least-squares scale per channel ignoring the clamp: s = sum(n v t) / sum(n v^2)
+    num = base @ stats.total.T  # (N, 3)
+    den = (base * base) @ stats.count.T
+    scales = np.clip(num / np.maximum(den, 1e-12), LOWER[3:], UPPER[3:])
+
+    params = np.column_stack([b, c, g, scales])
+    losses = stats.loss(model_outputs(params))
+    order = np.argsort(losses)
+    return params[order[:4]]
+
+
+def _nelder_mead(func, start, iterations=400, tolerance=1e-10):
+    """Small bounded Nelder-Mead (parameters are clipped to LOWER/UPPER)."""
+    dim = len(start)
+    span = UPPER - LOWER
+    simplex = [np.clip(start, LOWER, UPPER)]
+    for i in range(dim):
+        point = simplex[0].copy()
+        point[i] = np.clip(point[i] + 0.05 * span[i], LOWER[i], UPPER[i])
+        if point[i] == simplex[0][i]:
+            point[i] = np.clip(point[i] - 0.05 * span[i], LOWER[i], UPPER[i])
+        simplex.append(point)
+    simplex = np.array(simplex)
+    values = np.array([func(p) for p in simplex])
+
+    for _ in range(iterations):
+        order = np.argsort(values)
+        simplex, values = simplex[order], values[order]
+        if values[-1] - values[0] < tolerance:
+            break
+        centroid = simplex[:-1].mean(axis=0)
+        worst = simplex[-1]
+
+        reflected = np.clip(centroid + (centroid - worst), LOWER, UPPER)
+        fr = func(reflected)
+        if fr < values[0]:
+            expanded = np.clip(centroid + 2.0 * (centroid - worst), LOWER, UPPER)
+            fe = func(expanded)
+            simplex[-1], values[-1] = (expanded, fe) if fe < fr else (reflected, fr)
+        elif fr < values[-2]:
+            simplex[-1], values[-1] = reflected, fr
+        else:
+            contracted = np.clip(centroid + 0.5 * (worst - centroid), LOWER, UPPER)
+            fc = func(contracted)
+            if fc < values[-1]:
+                simplex[-1], values[-1] = contracted, fc
+            else:
+                # Shrink towards the best point
+                simplex[1:] = simplex[0] + 0.5 * (simplex[1:] - simplex[0])
+                values[1:] = [func(p) for p in simplex[1:]]
+
+    best = np.argmin(values)
+    return simplex[best], values[best]
+
+
+def fit_stats(stats):
+    """Returns (settings dict, RMSE in 8-bit levels)."""
+    def loss(p):
+        return float(stats.loss(model_outputs(p)))
+
+    best, best_loss = None, np.inf
+    for start in _grid_search(stats):
+        params, value = _nelder_mead(loss, start)
+        if value < best_loss:
+            best, best_loss = params, value
+
+    settings = {k: round(float(v), 3) for k, v in zip(PARAM_KEYS, best)}
+    return settings, float(np.sqrt(max(0.0, best_loss)) * 255.0)
+
+
+def fit_images(pairs):
+    """pairs: iterable of (before path, desired path)."""
+    stats = LevelStats()
+    for before_path, desired_path in pairs:
+        with Image.open(before_path) as before, Image.open(desired_path) as desired:
+            if desired.size != before.size:
+                print(f"Resizing {desired_path} to {before.size[0]}x{before.size[1]} to match {before_path}")
+                desired = desired.resize(before.size)
+            stats.add_pair(before, desired)
+    return fit_stats(stats)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit NVFT ramp parameters to before/desired image pairs.")
+    parser.add_argument("images", nargs="+", help="before1 desired1 [before2 desired2 ...]")
+    parser.add_argument("--name", help="Save the result as a preset with this name")
+    args = parser.parse_args(argv)
+
+    if len(args.images) % 2:
+        parser.error("images must be given as before/desired pairs")
+    pairs = list(zip(args.images[::2], args.images[1::2]))
+
+    settings, rmse = fit_images(pairs)
+    for k in PARAM_KEYS:
+        print(f"{k:<12} {settings[k]:.3f}")
+    print(f"RMSE: {rmse:.2f} levels (0-255)")
+
+    if args.name:
+        # Imported here: ConfigManager needs Windows (registry, %LOCALAPPDATA%)
+        from .config import ConfigManager
+        ConfigManager().save_preset(args.name, settings)
+        print(f"Saved preset '{args.name}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
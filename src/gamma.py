@@ -1,11 +1,10 @@
 import ctypes
-import math
-from ctypes import windll, byref, Structure, c_int, c_ushort, POINTER, c_wchar, WINFUNCTYPE
+import threading
+from ctypes import windll, byref, Structure, c_int, POINTER, c_wchar, WINFUNCTYPE
+from .ramp import RAMP, RampBuffers, ramp_params, ramp_table
+from .diagnostics import diag
 
 # Windows GDI Structures
-class RAMP(Structure):
-    _fields_ = [("Red", c_ushort * 256), ("Green", c_ushort * 256), ("Blue", c_ushort * 256)]
-
 class RECT(Structure):
     _fields_ = [("left", c_int), ("top", c_int), ("right", c_int), ("bottom", c_int)]
 
@@ -26,11 +25,33 @@ windll.gdi32.GetDeviceGammaRamp.argtypes = [ctypes.c_void_p, POINTER(RAMP)]
 MonitorEnumProc = WINFUNCTYPE(c_int, ctypes.c_void_p, ctypes.c_void_p, POINTER(RECT), c_int)
 
 class GammaController:
-    def __init__(self):
+    def __init__(self, capture=True):
         self.original_ramp = RAMP()
         self.active = False
+        self._buffers = RampBuffers()
+        # ramp_version of the snapshot whose ramp is in the front buffer
+        self._front_version = None
+
+        # Hold-to-activate: ramp staged ahead of time and a DC kept open, so a transition is one upload
+        self.holding = False
+        self._staged_ramp = RAMP()
+        self._staged_version = None
+        self._hold_dc = None
+        # hold_begin/hold_end run on the keyboard thread: this guards the staged ramp, the hold DC
+        # and active/holding against the Tk thread (uncontended, it costs nanoseconds)
+        self._lock = threading.Lock()
+
+        # Preset cycling: ramps of the presets the next/previous step would load (keyed by step),
+        # with the (preset name, ramp_version of the settings they were built on) they are valid for
+        self._cycle_ramps = {1: RAMP(), -1: RAMP()}
+        self._cycle_keys = {}
         
-        # Save initial state
+        # Save initial state (main() runs this on a startup worker instead)
+        if capture:
+            self.capture_original()
+
+    def capture_original(self):
+        """Read the current ramp of the primary monitor so restore() can put it back."""
         dc = self._get_monitor_dc()
         if dc:
             if not windll.gdi32.GetDeviceGammaRamp(dc, byref(self.original_ramp)):
@@ -67,46 +88,149 @@ class GammaController:
 
     def restore(self):
         dc = self._get_monitor_dc()
+        with self._lock:
+            if dc:
+                windll.gdi32.SetDeviceGammaRamp(dc, byref(self.original_ramp))
+                windll.gdi32.DeleteDC(dc)
+            self.active = False
+            self.holding = False
+
+    # --- Hold-to-activate ---
+
+    def stage(self, settings):
+        """
+        Pre-compute the ramp used by hold_begin() and open the DC it uploads to.
+        Cheap when the snapshot's ramp is already staged (version check only).
+        """
+        version = getattr(settings, "ramp_version", None)
+        # The back buffer is scratch space until the next apply_settings (Tk thread only)
+        ramp = self._compute(settings) if version is None or version != self._staged_version else None
+        dc = None if self._hold_dc else self._get_monitor_dc()
+        with self._lock:
+            if ramp is not None:
+                ctypes.memmove(byref(self._staged_ramp), byref(ramp), ctypes.sizeof(RAMP))
+                self._staged_version = version
+            if dc and not self._hold_dc:
+                self._hold_dc, dc = dc, None
+        if dc:
+            windll.gdi32.DeleteDC(dc)
+
+    def _upload_staged(self, ramp):
+        """Upload through the hold DC; the caller holds self._lock."""
+        dc = self._hold_dc
+        if dc and windll.gdi32.SetDeviceGammaRamp(dc, byref(ramp)):
+            return True
+        # The display configuration may have changed: reopen the DC once and retry
+        if dc:
+            windll.gdi32.DeleteDC(dc)
+        self._hold_dc = self._get_monitor_dc()
+        return bool(self._hold_dc) and bool(windll.gdi32.SetDeviceGammaRamp(self._hold_dc, byref(ramp)))
+
+    def hold_begin(self):
+        """Upload the staged ramp (no math, no monitor lookup). Returns True if the state changed."""
+        with self._lock:
+            if self.active:
+                return False
+            if self._upload_staged(self._staged_ramp):
+                self.active = True
+                self.holding = True
+                return True
+            return False
+
+    def hold_end(self):
+        """Put the original ramp back if (and only if) hold_begin turned the filter on."""
+        with self._lock:
+            if not self.holding:
+                return False
+            self.holding = False
+            self._upload_staged(self.original_ramp)
+            self.active = False
+            return True
+
+    # --- Preset cycling ---
+
+    def prefetch(self, step, name, settings, base_version):
+        """
+        Stage the ramp of the preset a cycle step (+1 next, -1 previous) loads. base_version is
+        the ramp_version of the snapshot it was built on: presets missing some ramp keys inherit
+        the current values, so the staged ramp is only valid while those are unchanged.
+        """
+        ramp = self._compute(settings)
+        dc = None if self._hold_dc else self._get_monitor_dc()
+        with self._lock:
+            ctypes.memmove(byref(self._cycle_ramps[step]), byref(ramp), ctypes.sizeof(RAMP))
+            self._cycle_keys[step] = (name, base_version)
+            if dc and not self._hold_dc:
+                self._hold_dc, dc = dc, None
         if dc:
-            windll.gdi32.SetDeviceGammaRamp(dc, byref(self.original_ramp))
             windll.gdi32.DeleteDC(dc)
-        self.active = False
+
+    def apply_prefetched(self, step, name, base_version):
+        """
+        Upload the ramp prefetch() staged for `name` (no math, no monitor lookup).
+        Returns False if another preset is staged for this step, the settings changed since
+        (base_version differs) or the upload failed.
+        """
+        with self._lock:
+            if self._cycle_keys.get(step) != (name, base_version):
+                return False
+            ramp = self._cycle_ramps[step]
+            if not self._upload_staged(ramp):
+                return False
+            # It is on screen now, so it becomes the front buffer; adopt() tells which snapshot it is
+            self._buffers.load(ramp)
+            self._buffers.swap()
+            self._front_version = None
+            self.active = True
+            return True
+
+    def adopt(self, snapshot):
+        """The ramp uploaded by apply_prefetched() belongs to `snapshot`: re-applying it is free."""
+        with self._lock:
+            self._front_version = snapshot.ramp_version
+            ctypes.memmove(byref(self._staged_ramp), byref(self._buffers.front), ctypes.sizeof(RAMP))
+            self._staged_version = snapshot.ramp_version
+
+    def _compute(self, settings):
+        """Fill the back buffer for a SettingsSnapshot (precomputed) or a plain settings dict."""
+        if hasattr(settings, "ramp_version"):
+            table, params = settings.table, settings.ramp
+        else:
+            table = ramp_table(settings)
+            params = None if table is not None else ramp_params(settings)
+        if table is not None:
+            # Stored ramp (imported LUT): copied as-is, no math
+            return self._buffers.load(table)
+        return self._buffers.compute(params)
 
     def apply_settings(self, settings):
         """
-        Apply gamma ramp based on settings dict.
+        Apply gamma ramp based on a SettingsSnapshot (or a plain settings dict).
         keys: brightness, contrast, gamma, red_scale, green_scale, blue_scale
+        A snapshot whose ramp_version is already on screen re-uploads the front buffer without recomputing.
         """
         try:
-            b_input = float(settings.get("brightness", 0.53))
-            c_input = float(settings.get("contrast", 0.85))
-            gamma_val = max(0.1, float(settings.get("gamma", 2.4)))
-            r_scale = float(settings.get("red_scale", 1.0))
-            g_scale = float(settings.get("green_scale", 1.0))
-            b_scale = float(settings.get("blue_scale", 1.0))
-
-            brightness_offset = b_input - 0.5
-            contrast_gain = c_input * 2.0
-
-            new_ramp = RAMP()
-            for i in range(256):
-                val = i / 255.0
-                val = math.pow(val, 1.0 / gamma_val)
-                val = val + brightness_offset
-                val = (val - 0.5) * contrast_gain + 0.5
-                val = max(0.0, min(1.0, val))
-
-                new_ramp.Red[i] = int(max(0, min(65535, val * 65535 * r_scale)))
-                new_ramp.Green[i] = int(max(0, min(65535, val * 65535 * g_scale)))
-                new_ramp.Blue[i] = int(max(0, min(65535, val * 65535 * b_scale)))
+            version = getattr(settings, "ramp_version", None)
+            if version is not None and version == self._front_version:
+                new_ramp = self._buffers.front
+            else:
+                new_ramp = self._compute(settings)
 
             dc = self._get_monitor_dc()
             if dc:
-                windll.gdi32.SetDeviceGammaRamp(dc, byref(new_ramp))
-                windll.gdi32.DeleteDC(dc)
-                self.active = True
+                with self._lock:
+                    ok = windll.gdi32.SetDeviceGammaRamp(dc, byref(new_ramp))
+                    windll.gdi32.DeleteDC(dc)
+                    if ok and new_ramp is not self._buffers.front:
+                        self._buffers.swap()
+                        self._front_version = version
+                        if version is not None:
+                            # Keep the hold ramp in sync for free (1.5 KB copy)
+                            ctypes.memmove(byref(self._staged_ramp), byref(new_ramp), ctypes.sizeof(RAMP))
+                            self._staged_version = version
+                    self.active = True
                 return True
         except Exception as e:
-            print(f"Error applying gamma: {e}")
+            diag.error("gamma", "Error applying gamma", error=e)
             return False
         return False
@@ -1,6 +1,15 @@
 import customtkinter as ctk
+import os
 import threading
+from tkinter import filedialog, messagebox
+import concurrent.futures
 from .utils import resource_path
+from .config import RAMP_KEYS
+from .ramp import sample_curves
+from .colortemp import SLIDER_MIN, SLIDER_MAX, SLIDER_STEP
+from .metrics import meter
+from .debounce import debouncer
+from .diagnostics import diag
 
 # Appearance
 ctk.set_appearance_mode("Dark")
@@ -18,6 +27,19 @@ TEXT_MAIN = "#ffffff"
 TEXT_MUTED = "#9aa0b5"
 SECTION_LABEL = "#7a8098"
 
+# Ramp preview graph
+PREVIEW_HEIGHT = 96
+PREVIEW_SAMPLES = 48
+PREVIEW_INTERVAL_MS = 40  # Redraw at most ~25 times/s, independent of ramp uploads
+PREVIEW_COLORS = {"red": "#e5484d", "green": "#46a758", "blue": "#3e63dd"}
+
+# Quick-switch palette
+PALETTE_ROWS = 8
+
+# customtkinter polling loops (appearance mode every 30 ms, DPI scaling every 100 ms)
+CTK_LOOPS = ((ctk.AppearanceModeTracker, "update"), (ctk.ScalingTracker, "check_dpi_scaling"))
+
+
 class SettingsApp(ctk.CTk):
     def __init__(self, config_manager, gamma_controller, input_manager_ref):
         super().__init__()
@@ -29,6 +51,11 @@ class SettingsApp(ctk.CTk):
         # GUI needs to callback Input (to record hotkeys).
         # We will set input_manager via method or pass a wrapper.
         self.input_manager = input_manager_ref
+        self.profiler = None
+        self.scheduler = None
+        # Last loaded preset: where next/previous preset cycling continues from
+        self._cycle_current = None
+        self._prefetch_pending = False
         
         self.attributes("-topmost", self.config.current_settings.get("always_on_top", True))
         self.title("NVFT Control")
@@ -39,8 +66,21 @@ class SettingsApp(ctk.CTk):
         self.configure(fg_color=BG_COLOR)
         
         self.sliders = {}
+        self._preset_rows = {}
+        self._visible_presets = []
+        self._preview_lines = {}
+        self._preview_size = (1, PREVIEW_HEIGHT)
+        self._preview_pending = False
+        self._palette = None
+        self._palette_results = []
+        self._palette_selected = 0
+        self._palette_pending = False
+        self.idle = False
+        self._paused_loops = []
+        self._install_idle_gates()
         self._setup_ui()
         self.update_status_visuals()
+        self._schedule_prefetch()
 
     def _setup_ui(self):
         # Grid layout
@@ -68,13 +108,20 @@ class SettingsApp(ctk.CTk):
         self._create_slider(self.card_luminance, "Brightness", "brightness", 0.0, 1.0, 0.01)
         self._create_slider(self.card_luminance, "Contrast", "contrast", 0.0, 1.0, 0.01)
         self._create_slider(self.card_luminance, "Gamma", "gamma", 0.1, 5.0, 0.1)
+        self._build_ramp_preview(self.card_luminance)
 
         # Colors
         self._create_section_header("COLOR CHANNELS")
         self.card_color = self._create_card(self.scroll_frame, CARD_ALT_BG)
-        self._create_slider(self.card_color, "Red Boost", "red_scale", 0.0, 2.0, 0.05)
-        self._create_slider(self.card_color, "Green Boost", "green_scale", 0.0, 2.0, 0.05)
-        self._create_slider(self.card_color, "Blue Boost", "blue_scale", 0.0, 2.0, 0.05)
+        self._build_color_mode_switch(self.card_color)
+        # Either the three channel sliders or the Kelvin slider is shown, depending on color_mode
+        self.rgb_frame = ctk.CTkFrame(self.card_color, fg_color="transparent")
+        self._create_slider(self.rgb_frame, "Red Boost", "red_scale", 0.0, 2.0, 0.05)
+        self._create_slider(self.rgb_frame, "Green Boost", "green_scale", 0.0, 2.0, 0.05)
+        self._create_slider(self.rgb_frame, "Blue Boost", "blue_scale", 0.0, 2.0, 0.05)
+        self.temperature_frame = ctk.CTkFrame(self.card_color, fg_color="transparent")
+        self._create_slider(self.temperature_frame, "Temperature", "temperature", SLIDER_MIN, SLIDER_MAX, SLIDER_STEP, fmt="{:.0f} K")
+        self._show_color_mode()
 
         # Presets
         self._create_section_header("PRESETS")
@@ -95,7 +142,26 @@ class SettingsApp(ctk.CTk):
         lbl = ctk.CTkLabel(self.scroll_frame, text=text, font=("Segoe UI", 11, "bold"), text_color=SECTION_LABEL)
         lbl.pack(anchor="w", padx=4, pady=(8, 6))
 
-    def _create_slider(self, parent, label, setting_key, min_v, max_v, step):
+    def _build_color_mode_switch(self, parent):
+        row = ctk.CTkFrame(parent, fg_color="transparent")
+        row.pack(fill="x", padx=14, pady=(10, 0))
+        self.color_mode_var = ctk.BooleanVar(value=self.config.current_settings.get("color_mode") == "temperature")
+        ctk.CTkSwitch(row, text="Color temperature", variable=self.color_mode_var, command=self.toggle_color_mode, progress_color=ACCENT).pack(side="left")
+
+    def _show_color_mode(self):
+        temperature = self.config.current_settings.get("color_mode") == "temperature"
+        self.color_mode_var.set(temperature)
+        shown, hidden = (self.temperature_frame, self.rgb_frame) if temperature else (self.rgb_frame, self.temperature_frame)
+        hidden.pack_forget()
+        shown.pack(fill="x", pady=(0, 4))
+
+    def toggle_color_mode(self):
+        mode = "temperature" if self.color_mode_var.get() else "rgb"
+        self._ramp_changed(self.config.update_setting("color_mode", mode))
+        self._show_color_mode()
+        self._schedule_preview()
+
+    def _create_slider(self, parent, label, setting_key, min_v, max_v, step, fmt="{:.2f}"):
         container = ctk.CTkFrame(parent, fg_color="transparent")
         container.pack(fill="x", padx=14, pady=8)
         
@@ -113,14 +179,13 @@ class SettingsApp(ctk.CTk):
         
         current_val = self.config.current_settings.get(setting_key, 1.0)
         slider.set(current_val)
-        val_lbl.configure(text=f"{current_val:.2f}")
+        val_lbl.configure(text=fmt.format(current_val))
 
         def on_change(val):
             v = float(val)
-            val_lbl.configure(text=f"{v:.2f}")
-            self.config.update_setting(setting_key, v)
-            if self.gamma.active:
-                self.gamma.apply_settings(self.config.current_settings)
+            val_lbl.configure(text=fmt.format(v))
+            self._ramp_changed(self.config.update_setting(setting_key, v))
+            self._schedule_preview()
 
         slider.configure(command=on_change)
         
@@ -131,7 +196,46 @@ class SettingsApp(ctk.CTk):
             on_change(def_val)
         
         slider.bind("<Double-Button-1>", on_reset)
-        self.sliders[setting_key] = {"slider": slider, "label": val_lbl}
+        self.sliders[setting_key] = {"slider": slider, "label": val_lbl, "fmt": fmt}
+
+    def _build_ramp_preview(self, parent):
+        """Small R/G/B ramp graph. Line items are created once and only their coords change."""
+        self.preview_canvas = ctk.CTkCanvas(parent, height=PREVIEW_HEIGHT, bg=CARD_ALT_BG, highlightthickness=0, bd=0)
+        self.preview_canvas.pack(fill="x", padx=14, pady=(4, 12))
+
+        self._preview_diagonal = self.preview_canvas.create_line(0, 0, 0, 0, fill=BORDER_COLOR, dash=(2, 3))
+        for channel, color in PREVIEW_COLORS.items():
+            self._preview_lines[channel] = self.preview_canvas.create_line(0, 0, 0, 0, fill=color, width=2)
+
+        def on_resize(event):
+            self._preview_size = (max(1, event.width), max(1, event.height))
+            self._schedule_preview()
+
+        self.preview_canvas.bind("<Configure>", on_resize)
+
+    def _schedule_preview(self):
+        # Coalesce slider ticks: at most one redraw per PREVIEW_INTERVAL_MS
+        # While idle (hidden) nothing is drawn; show_window redraws once.
+        if self._preview_pending or self.idle:
+            return
+        self._preview_pending = True
+        self.after(PREVIEW_INTERVAL_MS, self._draw_preview)
+
+    def _draw_preview(self):
+        self._preview_pending = False
+        w, h = self._preview_size
+        w -= 1
+        h -= 1
+        curves = sample_curves(self.config.snapshot, PREVIEW_SAMPLES)
+        step = w / (PREVIEW_SAMPLES - 1)
+
+        self.preview_canvas.coords(self._preview_diagonal, 0, h, w, 0)
+        for channel, values in zip(PREVIEW_COLORS, curves):
+            coords = []
+            for i, v in enumerate(values):
+                coords.append(i * step)
+                coords.append(h - v * h)
+            self.preview_canvas.coords(self._preview_lines[channel], *coords)
 
     def _build_presets_section(self, parent):
         self.presets_container = ctk.CTkFrame(parent, fg_color=CARD_ALT_BG, corner_radius=8, border_width=1, border_color=BORDER_COLOR)
@@ -142,17 +246,21 @@ class SettingsApp(ctk.CTk):
         btn_frame.pack(fill="x", padx=14, pady=(0, 10))
         
         ctk.CTkButton(btn_frame, text="💾 Save Current", font=("Segoe UI", 12, "bold"), fg_color=SUCCESS, corner_radius=8, height=36, command=self.save_preset_dialog).pack(side="left", expand=True, fill="x", padx=(0, 4))
+        ctk.CTkButton(btn_frame, text="🔎", font=("Segoe UI", 12, "bold"), fg_color=ACCENT, corner_radius=8, width=36, height=36, command=self.open_quick_switch).pack(side="right", padx=(4, 0))
+        ctk.CTkButton(btn_frame, text="📥", font=("Segoe UI", 12, "bold"), fg_color=ACCENT, corner_radius=8, width=36, height=36, command=self.import_lut_dialog).pack(side="right", padx=(4, 0))
         ctk.CTkButton(btn_frame, text="⚙️ Manage", font=("Segoe UI", 12, "bold"), fg_color=ACCENT, corner_radius=8, height=36, command=self.manage_presets_dialog).pack(side="right", expand=True, fill="x", padx=(4, 0))
 
     def update_presets_list(self):
         for w in self.presets_container.winfo_children(): w.destroy()
+        self._preset_rows = {}
         
-        names = self.config.get_preset_names()
+        names = self.config.get_preset_names(5)
+        self._visible_presets = names
         if not names:
             ctk.CTkLabel(self.presets_container, text="No presets saved", text_color=TEXT_MUTED).pack(pady=12)
             return
 
-        for name in names[:5]:
+        for name in self._visible_presets:
             row = ctk.CTkFrame(self.presets_container, fg_color="transparent")
             row.pack(fill="x", padx=8, pady=4)
             
@@ -169,6 +277,23 @@ class SettingsApp(ctk.CTk):
             ent.bind("<Button-1>", lambda e, n=name, w=ent: self.record_preset_hotkey(n, w))
             
             ctk.CTkButton(row, text="Load", width=50, height=24, fg_color=ACCENT, command=lambda n=name: self.load_preset(n)).pack(side="right")
+            self._preset_rows[name] = ent
+
+    def refresh_preset_rows(self, names):
+        """Update only the rows of the given presets; rebuild only if the visible set changed."""
+        if self.config.get_preset_names(5) != self._visible_presets:
+            self.update_presets_list()
+            return
+
+        for name in names:
+            ent = self._preset_rows.get(name)
+            if ent is None:
+                continue
+            hk = self.config.presets[name].get("hotkey") or "No Hotkey"
+            ent.configure(state="normal")
+            ent.delete(0, "end")
+            ent.insert(0, hk)
+            ent.configure(state="readonly")
 
     def _build_general_settings(self, parent):
         row = ctk.CTkFrame(parent, fg_color="transparent")
@@ -180,6 +305,40 @@ class SettingsApp(ctk.CTk):
         self.main_hk_entry.insert(0, self.config.current_settings.get("hotkey", ""))
         self.main_hk_entry.configure(state="readonly")
         self.main_hk_entry.bind("<Button-1>", lambda e: self.record_main_hotkey())
+
+        row_palette = ctk.CTkFrame(parent, fg_color="transparent")
+        row_palette.pack(fill="x", padx=14, pady=(0, 10))
+
+        ctk.CTkLabel(row_palette, text="Quick Switch Shortcut", text_color=TEXT_MAIN).pack(side="left")
+        self.palette_hk_entry = ctk.CTkEntry(row_palette, width=150, font=("Consolas", 12))
+        self.palette_hk_entry.pack(side="right")
+        self.palette_hk_entry.insert(0, self.config.current_settings.get("palette_hotkey") or "No Hotkey")
+        self.palette_hk_entry.configure(state="readonly")
+        self.palette_hk_entry.bind("<Button-1>", lambda e: self.record_palette_hotkey())
+
+        row_hold = ctk.CTkFrame(parent, fg_color="transparent")
+        row_hold.pack(fill="x", padx=14, pady=(0, 10))
+
+        ctk.CTkLabel(row_hold, text="Hold Shortcut", text_color=TEXT_MAIN).pack(side="left")
+        self.hold_hk_entry = ctk.CTkEntry(row_hold, width=150, font=("Consolas", 12))
+        self.hold_hk_entry.pack(side="right")
+        self.hold_hk_entry.insert(0, self.config.current_settings.get("hold_hotkey") or "No Hotkey")
+        self.hold_hk_entry.configure(state="readonly")
+        self.hold_hk_entry.bind("<Button-1>", lambda e: self.record_hold_hotkey())
+
+        row_cycle = ctk.CTkFrame(parent, fg_color="transparent")
+        row_cycle.pack(fill="x", padx=14, pady=(0, 10))
+
+        # Cycle through the playlist (presets ticked "Cycle" in Manage)
+        ctk.CTkLabel(row_cycle, text="Prev / Next Preset", text_color=TEXT_MAIN).pack(side="left")
+        self.next_hk_entry = ctk.CTkEntry(row_cycle, width=73, font=("Consolas", 12))
+        self.next_hk_entry.pack(side="right")
+        self.prev_hk_entry = ctk.CTkEntry(row_cycle, width=73, font=("Consolas", 12))
+        self.prev_hk_entry.pack(side="right", padx=(0, 4))
+        for step, entry, key in ((1, self.next_hk_entry, "cycle_next_hotkey"), (-1, self.prev_hk_entry, "cycle_prev_hotkey")):
+            entry.insert(0, self.config.current_settings.get(key) or "None")
+            entry.configure(state="readonly")
+            entry.bind("<Button-1>", lambda e, s=step: self.record_cycle_hotkey(s))
         
         row2 = ctk.CTkFrame(parent, fg_color="transparent")
         row2.pack(fill="x", padx=14, pady=5)
@@ -198,34 +357,258 @@ class SettingsApp(ctk.CTk):
         if self.gamma.active:
             self.gamma.restore()
         else:
-            self.gamma.apply_settings(self.config.current_settings)
+            self.gamma.apply_settings(self.config.snapshot)
+        diag.info("gamma", "toggle", active=self.gamma.active)
         self.update_status_visuals()
 
+    def _ramp_changed(self, snapshot):
+        """Ramp settings changed: apply them if active, otherwise re-stage the hold ramp."""
+        if self.gamma.active:
+            self.gamma.apply_settings(snapshot)
+        elif snapshot.get("hold_hotkey"):
+            self.gamma.stage(snapshot)
+        # Presets missing some ramp keys inherit the current values: re-stage the cycle ramps
+        self._schedule_prefetch()
+
     def update_status_visuals(self):
         if self.gamma.active:
             self.status_badge.configure(text="ACTIVE", fg_color=SUCCESS)
         else:
             self.status_badge.configure(text="OFF", fg_color=DANGER)
 
-    def load_preset(self, name):
+    def _preset_changes(self, name):
+        """The ramp settings loading a preset changes."""
+        p = self.config.presets[name]
+        changes = {k: p[k] for k in RAMP_KEYS if k in p}
+        # Presets saved before color temperature mode existed use the channel sliders
+        changes.setdefault("color_mode", "rgb")
+        # Only imported LUT presets carry a stored ramp
+        changes.setdefault("custom_ramp", None)
+        return changes
+
+    def load_preset(self, name, apply=True):
         if name in self.config.presets:
-            p = self.config.presets[name]
-            # Update settings object
-            for k in ["brightness", "contrast", "gamma", "red_scale", "green_scale", "blue_scale"]:
-                if k in p: self.config.current_settings[k] = p[k]
+            # Update settings (one new snapshot for all keys)
+            self.config.update_settings(self._preset_changes(name))
+            diag.info("presets", "load", name=name)
+            if self._cycle_current != name:
+                self._cycle_current = name
+                # Cycling continues from here: stage the new neighbours once the UI is idle
+                self._schedule_prefetch()
             
             # Update Sliders
-            for k, w in self.sliders.items():
-                val = self.config.current_settings.get(k, 1.0)
-                w["slider"].set(val)
-                w["label"].configure(text=f"{val:.2f}")
+            self._sync_sliders(RAMP_KEYS)
             
-            # Apply if active
-            if self.gamma.active:
-                self.gamma.apply_settings(self.config.current_settings)
+            # Apply if active (batched IPC commands apply once at the end instead)
+            if apply:
+                self._ramp_changed(self.config.snapshot)
             
-            # Persist changes
+                # Persist changes
+                self.config.save_settings()
+            return True
+        return False
+
+    # --- Preset cycling ---
+
+    def _cycle_target(self, step):
+        """Playlist preset a step (+1 next, -1 previous) from the current one loads, or None."""
+        playlist = self.config.playlist()
+        if not playlist:
+            return None
+        if self._cycle_current in playlist:
+            return playlist[(playlist.index(self._cycle_current) + step) % len(playlist)]
+        # Current preset not in the playlist: start from either end
+        return playlist[0] if step > 0 else playlist[-1]
+
+    def _schedule_prefetch(self):
+        # Coalesced: one prefetch per idle pass, however many changes (slider ticks) came before
+        if self._prefetch_pending:
+            return
+        self._prefetch_pending = True
+        self.after_idle(self.prefetch_cycle)
+
+    def prefetch_cycle(self):
+        """Stage the ramps of the next and previous playlist presets, so a cycle press is one upload."""
+        self._prefetch_pending = False
+        snapshot = self.config.snapshot
+        for step in (1, -1):
+            name = self._cycle_target(step)
+            if name is None:
+                return
+            settings = dict(snapshot.values)
+            settings.update(self._preset_changes(name))
+            self.gamma.prefetch(step, name, settings, snapshot.ramp_version)
+
+    def cycle_preset(self, step, apply=True):
+        """Load the next (+1) or previous (-1) playlist preset. Returns its name, None if the playlist is empty."""
+        name = self._cycle_target(step)
+        if name is None:
+            return None
+        # Upload the staged ramp before any settings work; falls back to a normal load if it is
+        # stale (other preset staged, or ramp settings changed since the prefetch)
+        uploaded = apply and self.gamma.active and self.gamma.apply_prefetched(step, name, self.config.snapshot.ramp_version)
+        self.load_preset(name, apply=apply and not uploaded)
+        if uploaded:
+            self.gamma.adopt(self.config.snapshot)
             self.config.save_settings()
+        return name
+
+    def set_parameter(self, key, value):
+        """Set a single ramp parameter without applying it (used by the control protocol)."""
+        self.config.update_setting(key, value)
+        self._sync_sliders([key])
+
+    def get_status(self):
+        status = {"active": self.gamma.active, "presets": len(self.config.presets), "preset": self._cycle_current}
+        for k in RAMP_KEYS:
+            status[k] = self.config.current_settings.get(k)
+        # Report whether a stored ramp is active, not the 768 values
+        status["custom_ramp"] = bool(status["custom_ramp"])
+        status["suppressed"] = debouncer.counts()
+        return status
+
+    def _sync_sliders(self, keys):
+        for k in keys:
+            if k == "color_mode":
+                self._show_color_mode()
+                continue
+            w = self.sliders.get(k)
+            if w is None:
+                continue
+            val = self.config.current_settings.get(k, 1.0)
+            w["slider"].set(val)
+            w["label"].configure(text=w["fmt"].format(val))
+        self._schedule_preview()
+
+    def reload_config(self):
+        """Pick up external edits of settings.json / presets.json, touching only what changed."""
+        changed_keys, changed_presets = self.config.reload_changed()
+
+        if changed_keys:
+            self._sync_sliders(changed_keys)
+            if "hotkey" in changed_keys:
+                self.main_hk_entry.configure(state="normal")
+                self.main_hk_entry.delete(0, "end")
+                self.main_hk_entry.insert(0, self.config.current_settings.get("hotkey", ""))
+                self.main_hk_entry.configure(state="readonly")
+                if self.input_manager: self.input_manager.refresh_main_hotkey()
+            if "palette_hotkey" in changed_keys:
+                self.palette_hk_entry.configure(state="normal")
+                self.palette_hk_entry.delete(0, "end")
+                self.palette_hk_entry.insert(0, self.config.current_settings.get("palette_hotkey") or "No Hotkey")
+                self.palette_hk_entry.configure(state="readonly")
+                if self.input_manager: self.input_manager.refresh_palette_hotkey()
+            if "debounce_ms" in changed_keys:
+                debouncer.configure(self.config.current_settings.get("debounce_ms"))
+            if not changed_keys.isdisjoint(("cycle_next_hotkey", "cycle_prev_hotkey")):
+                self._set_entry(self.next_hk_entry, self.config.current_settings.get("cycle_next_hotkey") or "None")
+                self._set_entry(self.prev_hk_entry, self.config.current_settings.get("cycle_prev_hotkey") or "None")
+                if self.input_manager: self.input_manager.refresh_cycle_hotkeys()
+            if "schedule" in changed_keys and self.scheduler:
+                self.scheduler.set_schedule(self.config.current_settings.get("schedule"))
+            if "autostart" in changed_keys:
+                self.autostart_var.set(self.config.current_settings.get("autostart", False))
+                self.config.sync_autostart_registry()
+            if "always_on_top" in changed_keys:
+                val = self.config.current_settings.get("always_on_top", True)
+                self.topmost_var.set(val)
+                self.attributes("-topmost", val)
+            if "hold_hotkey" in changed_keys:
+                self._set_entry(self.hold_hk_entry, self.config.current_settings.get("hold_hotkey") or "No Hotkey")
+                if self.input_manager: self.input_manager.refresh_hold_hotkey()
+                self.gamma.stage(self.config.snapshot)
+            if not changed_keys.isdisjoint(RAMP_KEYS):
+                self._ramp_changed(self.config.snapshot)
+
+        if changed_presets or "playlist" in changed_keys:
+            self.prefetch_cycle()
+        if changed_presets:
+            if self.input_manager: self.input_manager.refresh_preset_hotkeys(changed_presets)
+            self.refresh_preset_rows(changed_presets)
+            if self._palette is not None and self._palette.winfo_viewable():
+                self._refresh_quick_switch()
+
+    # --- Quick Switch Palette ---
+
+    def open_quick_switch(self):
+        self._leave_idle()
+        if self._palette is None or not self._palette.winfo_exists():
+            self._build_quick_switch()
+        self._palette_query.set("")
+        self._refresh_quick_switch()
+        self._palette.deiconify()
+        self._palette.lift()
+        self._palette.focus_force()
+        self._palette_entry.focus_set()
+
+    def _build_quick_switch(self):
+        win = ctk.CTkToplevel(self)
+        win.title("Quick Switch")
+        win.geometry("360x360")
+        win.resizable(False, False)
+        win.configure(fg_color=BG_COLOR)
+        win.attributes("-topmost", True)
+        win.protocol("WM_DELETE_WINDOW", self._close_quick_switch)
+        self._palette = win
+
+        self._palette_query = ctk.StringVar()
+        self._palette_entry = ctk.CTkEntry(win, textvariable=self._palette_query, placeholder_text="Search presets...", font=("Segoe UI", 14), height=36, corner_radius=8)
+        self._palette_entry.pack(fill="x", padx=14, pady=(14, 8))
+        self._palette_query.trace_add("write", lambda *args: self._schedule_quick_switch())
+
+        # Fixed pool of result rows; each keystroke only reconfigures them
+        self._palette_buttons = []
+        for i in range(PALETTE_ROWS):
+            btn = ctk.CTkButton(win, text="", anchor="w", font=("Segoe UI", 12), height=30, corner_radius=6, fg_color=CARD_ALT_BG, hover_color=ACCENT, command=lambda i=i: self._pick_quick_switch(i))
+            btn.pack(fill="x", padx=14, pady=2)
+            self._palette_buttons.append(btn)
+
+        def move(delta):
+            if self._palette_results:
+                self._palette_selected = (self._palette_selected + delta) % len(self._palette_results)
+                self._highlight_quick_switch()
+            return "break"
+
+        self._palette_entry.bind("<Down>", lambda e: move(1))
+        self._palette_entry.bind("<Up>", lambda e: move(-1))
+        self._palette_entry.bind("<Return>", lambda e: self._pick_quick_switch(self._palette_selected))
+        win.bind("<Escape>", lambda e: self._close_quick_switch())
+
+    def _schedule_quick_switch(self):
+        # Coalesce keystrokes: one search for everything typed since the last refresh
+        if self._palette_pending:
+            return
+        self._palette_pending = True
+        self.after_idle(self._refresh_quick_switch)
+
+    def _refresh_quick_switch(self):
+        self._palette_pending = False
+        self._palette_results = self.config.search_presets(self._palette_query.get(), PALETTE_ROWS)
+        self._palette_selected = 0
+        for i, btn in enumerate(self._palette_buttons):
+            if i < len(self._palette_results):
+                btn.configure(text=self._palette_results[i], state="normal")
+            else:
+                btn.configure(text="", state="disabled")
+        self._highlight_quick_switch()
+
+    def _highlight_quick_switch(self):
+        for i, btn in enumerate(self._palette_buttons):
+            btn.configure(fg_color=ACCENT if i == self._palette_selected and i < len(self._palette_results) else CARD_ALT_BG)
+
+    def _pick_quick_switch(self, index):
+        if self._palette_pending:
+            # Enter pressed before the coalesced search ran: pick from the current query
+            self._refresh_quick_switch()
+        if index < len(self._palette_results):
+            name = self._palette_results[index]
+            self._close_quick_switch()
+            self.load_preset(name)
+
+    def _close_quick_switch(self):
+        self._palette.withdraw()
+        if not self.winfo_viewable():
+            self._enter_idle()
 
     def save_preset_dialog(self):
         d = ctk.CTkInputDialog(text="Name:", title="Save Preset")
@@ -233,9 +616,41 @@ class SettingsApp(ctk.CTk):
         if name:
             self.config.save_preset(name, self.config.current_settings)
             self.update_presets_list()
+            self.prefetch_cycle()
             # Register hotkeys again in case new preset needs one (though save_preset preserves old hk)
             if self.input_manager: self.input_manager.register_shortcuts()
 
+    def import_lut_dialog(self):
+        path = filedialog.askopenfilename(title="Import LUT", filetypes=[("LUT files", "*.cube *.spi1d"), ("All files", "*.*")])
+        if not path:
+            return
+
+        # Parsing a large 3D LUT takes a moment: keep it off the UI thread
+        def worker():
+            try:
+                from .lut import import_lut
+                result = import_lut(path)
+            except Exception as e:
+                diag.error("lut", "LUT import failed", file=path, error=e)
+                result = e
+            self.after(0, lambda: self._on_lut_imported(path, result))
+
+        threading.Thread(target=worker, daemon=True, name="NVFT-lut").start()
+
+    def _on_lut_imported(self, path, result):
+        if isinstance(result, Exception):
+            messagebox.showerror("Import LUT", f"Could not import {os.path.basename(path)}:\n{result}")
+            return
+        ramp, rms, peak = result
+        d = ctk.CTkInputDialog(text=f"Per-channel approximation error: RMS {rms:.2f}, max {peak:.2f} levels (0-255).\n\nPreset name:", title="Import LUT")
+        name = d.get_input()
+        if name:
+            from .lut import lut_preset_values
+            self.config.save_preset(name, lut_preset_values(self.config, ramp))
+            self.update_presets_list()
+            self.prefetch_cycle()
+            if self.input_manager: self.input_manager.register_shortcuts()
+
     def manage_presets_dialog(self):
         """Mostra finestra per gestire (rinominare/eliminare) preset"""
         preset_names = self.config.get_preset_names()
@@ -246,7 +661,7 @@ class SettingsApp(ctk.CTk):
         # Crea finestra popup
         manage_window = ctk.CTkToplevel(self)
         manage_window.title("Manage Presets")
-        manage_window.geometry("380x450")
+        manage_window.geometry("460x450")
         manage_window.resizable(False, False)
         manage_window.configure(fg_color=BG_COLOR)
         manage_window.attributes("-topmost", True)
@@ -279,6 +694,7 @@ class SettingsApp(ctk.CTk):
                 widget.destroy()
             
             current_presets = self.config.get_preset_names()
+            playlist = self.config.playlist()
             
             if not current_presets:
                 ctk.CTkLabel(scroll_frame, text="No presets to manage.", text_color=TEXT_MUTED).pack(pady=20)
@@ -307,6 +723,17 @@ class SettingsApp(ctk.CTk):
                 # Bottoni
                 btn_container = ctk.CTkFrame(preset_frame, fg_color="transparent")
                 btn_container.pack(side="right", padx=8, pady=6)
+
+                # In the Prev / Next Preset playlist
+                cycle_var = ctk.BooleanVar(value=preset_name in playlist)
+                ctk.CTkCheckBox(
+                    btn_container,
+                    text="Cycle",
+                    width=60,
+                    variable=cycle_var,
+                    fg_color=ACCENT,
+                    command=lambda name=preset_name, var=cycle_var: set_in_playlist(name, var.get())
+                ).pack(side="left", padx=2)
                 
                 # Rename
                 btn_rename = ctk.CTkButton(
@@ -346,14 +773,22 @@ class SettingsApp(ctk.CTk):
             if new_name and new_name.strip() and new_name.strip() != old_name:
                 new_name = new_name.strip()
                 if self.config.rename_preset(old_name, new_name):
+                    if self._cycle_current == old_name:
+                        self._cycle_current = new_name
                     refresh_list()
                     self.update_presets_list()
+                    self.prefetch_cycle()
         
         def delete_preset(preset_name):
             if self.config.delete_preset(preset_name):
                 refresh_list()
                 self.update_presets_list()
+                self.prefetch_cycle()
                 if self.input_manager: self.input_manager.register_shortcuts()
+
+        def set_in_playlist(preset_name, included):
+            self.config.set_in_playlist(preset_name, included)
+            self.prefetch_cycle()
         
         refresh_list()
         
@@ -410,6 +845,72 @@ class SettingsApp(ctk.CTk):
         
         self.after(0, ui_update)
 
+    def record_palette_hotkey(self):
+        self.palette_hk_entry.configure(state="normal")
+        self.palette_hk_entry.delete(0, "end")
+        self.palette_hk_entry.insert(0, "Press key...")
+        self.palette_hk_entry.configure(state="readonly")
+
+        self.input_manager.record_hotkey(self._on_palette_hotkey_recorded)
+
+    def _on_palette_hotkey_recorded(self, hotkey):
+        def ui_update():
+            self.palette_hk_entry.configure(state="normal")
+            self.palette_hk_entry.delete(0, "end")
+            if hotkey:
+                self.palette_hk_entry.insert(0, hotkey)
+                self.input_manager.update_palette_hotkey(hotkey)
+            else:
+                self.palette_hk_entry.insert(0, self.config.current_settings.get("palette_hotkey") or "No Hotkey")
+                # Restore shortcuts since we unregistered them
+                self.input_manager.register_shortcuts()
+            self.palette_hk_entry.configure(state="readonly")
+
+        self.after(0, ui_update)
+
+    def record_hold_hotkey(self):
+        self._set_entry(self.hold_hk_entry, "Press key...")
+        self.input_manager.record_hotkey(self._on_hold_hotkey_recorded)
+
+    def _on_hold_hotkey_recorded(self, hotkey):
+        def ui_update():
+            if hotkey:
+                self._set_entry(self.hold_hk_entry, hotkey)
+                self.input_manager.update_hold_hotkey(hotkey)
+                self.gamma.stage(self.config.snapshot)
+            else:
+                self._set_entry(self.hold_hk_entry, self.config.current_settings.get("hold_hotkey") or "No Hotkey")
+                # Restore shortcuts since we unregistered them
+                self.input_manager.register_shortcuts()
+
+        self.after(0, ui_update)
+
+    def record_cycle_hotkey(self, step):
+        self._set_entry(self._cycle_entry(step), "Press key...")
+        self.input_manager.record_hotkey(lambda k: self._on_cycle_hotkey_recorded(step, k))
+
+    def _on_cycle_hotkey_recorded(self, step, hotkey):
+        def ui_update():
+            if hotkey:
+                self._set_entry(self._cycle_entry(step), hotkey)
+                self.input_manager.update_cycle_hotkey(step, hotkey)
+            else:
+                key = "cycle_next_hotkey" if step > 0 else "cycle_prev_hotkey"
+                self._set_entry(self._cycle_entry(step), self.config.current_settings.get(key) or "None")
+                # Restore shortcuts since we unregistered them
+                self.input_manager.register_shortcuts()
+
+        self.after(0, ui_update)
+
+    def _cycle_entry(self, step):
+        return self.next_hk_entry if step > 0 else self.prev_hk_entry
+
+    def _set_entry(self, entry, text):
+        entry.configure(state="normal")
+        entry.delete(0, "end")
+        entry.insert(0, text)
+        entry.configure(state="readonly")
+
     def record_preset_hotkey(self, name, widget):
         widget.configure(state="normal")
         widget.delete(0, "end")
@@ -437,16 +938,93 @@ class SettingsApp(ctk.CTk):
 
     def hide_window(self):
         self.withdraw()
+        self._enter_idle()
 
     def show_window(self):
+        self._leave_idle()
         self.deiconify()
         self.lift()
         self.focus_force()
 
+    # --- Idle Mode ---
+    # While the window is hidden no Python timers run: customtkinter's polling loops are
+    # gated off and our own redraws are skipped. Everything else (IPC, hotkeys, file watcher,
+    # tray) blocks in the OS until an event arrives.
+
+    def after(self, ms, func=None, *args):
+        if func is None:
+            return super().after(ms)
+
+        def counted(*a):
+            meter.wakeup("tk")
+            return func(*a)
+
+        return super().after(ms, counted, *args)
+
+    def _install_idle_gates(self):
+        for tracker, name in CTK_LOOPS:
+            original = getattr(tracker, name)
+            if getattr(original, "_nvft_gate", False):
+                continue
+
+            def gated(tracker=tracker, name=name, original=original):
+                if self.idle:
+                    # Let the loop drop out; _leave_idle restarts it
+                    tracker.update_loop_running = False
+                    self._paused_loops.append((tracker, name))
+                    return
+                original()
+
+            gated._nvft_gate = True
+            setattr(tracker, name, staticmethod(gated))
+
+    def _enter_idle(self):
+        if self._palette is not None and self._palette.winfo_viewable():
+            return  # Palette still on screen
+        self.idle = True
+
+    def _leave_idle(self):
+        if not self.idle:
+            return
+        self.idle = False
+        paused, self._paused_loops = self._paused_loops, []
+        for tracker, name in paused:
+            if not tracker.update_loop_running:
+                tracker.update_loop_running = True
+                self.after(tracker.update_loop_interval, getattr(tracker, name))
+        self._schedule_preview()
+
     # Thread Safe External Calls
     def external_toggle(self):
         self.after(0, self.toggle_filter)
     
+    def external_status_changed(self):
+        self.after(0, self.update_status_visuals)
+
     def external_load_preset(self, name):
         self.after(0, lambda: self.load_preset(name))
 
+    def external_cycle(self, step):
+        self.after(0, lambda: self.cycle_preset(step))
+
+    def call_in_ui(self, func):
+        """Run func on the Tk thread; returns a concurrent Future with its result."""
+        future = concurrent.futures.Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                future.set_exception(e)
+
+        self.after(0, run)
+        return future
+
+    def external_quick_switch(self):
+        self.after(0, self.open_quick_switch)
+
+    def external_config_reload(self):
+        self.after(0, self.reload_config)
+
@@ -1,14 +1,59 @@
 import keyboard
 import threading
 import time
+from .metrics import meter
+from .debounce import debouncer
+from .diagnostics import diag
+
+
+def _key_name(name):
+    """Event/hotkey key name without the side of modifiers ('right ctrl' -> 'ctrl')."""
+    return name.lower().replace("left ", "").replace("right ", "")
+
+
+def _combo_keys(hotkey):
+    return frozenset(_key_name(k.strip()) for k in hotkey.split("+"))
+
+
+# Preset cycling step -> setting holding its hotkey
+CYCLE_HOTKEYS = {1: "cycle_next_hotkey", -1: "cycle_prev_hotkey"}
+
+
+def cycle_action(step):
+    """Debounce key of a cycle step (shared with the IPC next/prev commands)."""
+    return "cycle:next" if step > 0 else "cycle:prev"
 
 class InputManager:
-    def __init__(self, config_manager, toggle_callback, preset_callback=None):
+    def __init__(self, config_manager, toggle_callback, preset_callback=None, palette_callback=None, hold_callback=None, cycle_callback=None):
         self.config = config_manager
         self.toggle_cb = toggle_callback
         self.preset_cb = preset_callback
+        self.palette_cb = palette_callback
+        # hold_callback(True) on press, hold_callback(False) on release; runs on the keyboard thread
+        self.hold_cb = hold_callback
+        # cycle_callback(+1) for the next playlist preset, cycle_callback(-1) for the previous one
+        self.cycle_cb = cycle_callback
         self.main_hotkey = self.config.current_settings.get("hotkey")
+        self.palette_hotkey = self.config.current_settings.get("palette_hotkey")
+        self.hold_hotkey = self.config.current_settings.get("hold_hotkey")
+        self.cycle_hotkeys = {step: self.config.current_settings.get(key) for step, key in CYCLE_HOTKEYS.items()}
         self.is_recording = False
+        self._main_handle = None
+        self._palette_handle = None
+        self._preset_handles = {}
+        self._hold_handle = None
+        self._cycle_handles = {}
+        self._hold_keys = frozenset()
+        self._holding = False
+        # action -> keys of a combo that fired and is still held (autorepeat is ignored until release)
+        self._fired = {}
+
+        # One release hook for all bindings: it re-arms fired combos and ends a hold.
+        # It is not a hotkey, so unhook_all_hotkeys leaves it in place.
+        try:
+            keyboard.on_release(self._on_key_release)
+        except Exception as e:
+            diag.error("hotkeys", "Failed to hook key releases", error=e)
         
         # Initial registration
         self.register_shortcuts()
@@ -22,34 +67,190 @@ class InputManager:
             keyboard.unhook_all_hotkeys()
         except Exception:
             pass
+        self._main_handle = None
+        self._palette_handle = None
+        self._preset_handles = {}
+        self._hold_handle = None
+        self._cycle_handles = {}
+        self._end_hold()
         
         # Main Toggle
+        self._bind_main()
+
+        # Quick-switch palette
+        self._bind_palette()
+
+        # Hold-to-activate
+        self._bind_hold()
+
+        # Next / previous playlist preset
+        self._bind_cycle()
+
+        # Presets
+        for name in self.config.presets:
+            self._bind_preset(name)
+
+    def _bind_main(self):
         if self.main_hotkey:
             try:
                 # suppress=False ensures the key event is passed to other apps (like games)
-                keyboard.add_hotkey(self.main_hotkey, self._on_toggle, suppress=False)
+                self._main_handle = keyboard.add_hotkey(self.main_hotkey, self._on_toggle, suppress=False)
             except Exception as e:
-                print(f"Failed to register main hotkey '{self.main_hotkey}': {e}")
+                diag.error("hotkeys", "Failed to register main hotkey", hotkey=self.main_hotkey, error=e)
 
-        # Presets
-        for name, data in self.config.presets.items():
-            if isinstance(data, dict):
-                hk = data.get("hotkey")
-                if hk:
-                    try:
-                        # Capture name in lambda default arg to avoid closure scope issues
-                        keyboard.add_hotkey(hk, lambda n=name: self._on_preset(n), suppress=False)
-                    except Exception as e:
-                        print(f"Failed to register hotkey '{hk}' for preset {name}: {e}")
+    def _bind_palette(self):
+        if self.palette_hotkey and self.palette_cb:
+            try:
+                self._palette_handle = keyboard.add_hotkey(self.palette_hotkey, self._on_palette, suppress=False)
+            except Exception as e:
+                diag.error("hotkeys", "Failed to register palette hotkey", hotkey=self.palette_hotkey, error=e)
+
+    def _bind_hold(self):
+        if self.hold_hotkey and self.hold_cb:
+            try:
+                # Autorepeat re-fires the hotkey while held; _on_hold_press only acts on the first one
+                self._hold_handle = keyboard.add_hotkey(self.hold_hotkey, self._on_hold_press, suppress=False)
+                # Releasing any key of the combo ends the hold (see _on_key_release)
+                self._hold_keys = _combo_keys(self.hold_hotkey)
+            except Exception as e:
+                diag.error("hotkeys", "Failed to register hold hotkey", hotkey=self.hold_hotkey, error=e)
+
+    def _bind_cycle(self):
+        if not self.cycle_cb:
+            return
+        for step, hk in self.cycle_hotkeys.items():
+            if hk:
+                try:
+                    self._cycle_handles[step] = keyboard.add_hotkey(hk, lambda s=step, h=hk: self._on_cycle(s, h), suppress=False)
+                except Exception as e:
+                    diag.error("hotkeys", "Failed to register cycle hotkey", hotkey=hk, action=cycle_action(step), error=e)
+
+    def _bind_preset(self, name):
+        data = self.config.presets.get(name)
+        if isinstance(data, dict):
+            hk = data.get("hotkey")
+            if hk:
+                try:
+                    # Capture name in lambda default arg to avoid closure scope issues
+                    self._preset_handles[name] = keyboard.add_hotkey(hk, lambda n=name, h=hk: self._on_preset(n, h), suppress=False)
+                except Exception as e:
+                    diag.error("hotkeys", "Failed to register preset hotkey", hotkey=hk, preset=name, error=e)
+
+    def _unbind(self, handle):
+        try:
+            keyboard.remove_hotkey(handle)
+        except Exception:
+            pass
+
+    def refresh_main_hotkey(self):
+        """Re-register only the toggle hotkey (e.g. after settings.json changed on disk)."""
+        self.main_hotkey = self.config.current_settings.get("hotkey")
+        if self.is_recording:
+            return
+        if self._main_handle is not None:
+            self._unbind(self._main_handle)
+            self._main_handle = None
+        self._bind_main()
+
+    def refresh_palette_hotkey(self):
+        """Re-register only the quick-switch palette hotkey."""
+        self.palette_hotkey = self.config.current_settings.get("palette_hotkey")
+        if self.is_recording:
+            return
+        if self._palette_handle is not None:
+            self._unbind(self._palette_handle)
+            self._palette_handle = None
+        self._bind_palette()
+
+    def refresh_hold_hotkey(self):
+        """Re-register only the hold-to-activate hotkey."""
+        self.hold_hotkey = self.config.current_settings.get("hold_hotkey")
+        if self.is_recording:
+            return
+        if self._hold_handle is not None:
+            self._unbind(self._hold_handle)
+            self._hold_handle = None
+        self._end_hold()
+        self._bind_hold()
+
+    def refresh_cycle_hotkeys(self):
+        """Re-register only the next/previous preset hotkeys."""
+        self.cycle_hotkeys = {step: self.config.current_settings.get(key) for step, key in CYCLE_HOTKEYS.items()}
+        if self.is_recording:
+            return
+        for handle in self._cycle_handles.values():
+            self._unbind(handle)
+        self._cycle_handles = {}
+        self._bind_cycle()
+
+    def refresh_preset_hotkeys(self, names):
+        """Re-register only the hotkeys of the given presets (added, removed or changed)."""
+        if self.is_recording:
+            return
+        for name in names:
+            handle = self._preset_handles.pop(name, None)
+            if handle is not None:
+                self._unbind(handle)
+            self._bind_preset(name)
+
+    def _edge(self, action, hotkey):
+        """
+        Edge trigger + debounce: only the first press of a combo passes, autorepeat while it
+        stays held is dropped, and a new press within the debounce window (shared with IPC) too.
+        """
+        if action in self._fired:
+            debouncer.suppress("keyboard", "autorepeat")
+            return False
+        self._fired[action] = _combo_keys(hotkey)
+        return debouncer.allow(action, "keyboard")
+
+    def _on_key_release(self, event):
+        # Runs for every key up: keep the common case (nothing held) to one check
+        if not self._fired and not self._holding:
+            return
+        name = _key_name(event.name or "")
+        for action in [a for a, keys in self._fired.items() if name in keys]:
+            del self._fired[action]
+        if self._holding and name in self._hold_keys:
+            meter.wakeup("keyboard")
+            self._end_hold()
 
     def _on_toggle(self):
-        if self.toggle_cb:
+        meter.wakeup("keyboard")
+        if self._edge("toggle", self.main_hotkey) and self.toggle_cb:
             self.toggle_cb()
 
-    def _on_preset(self, preset_name):
-        if self.preset_cb:
+    def _on_preset(self, preset_name, hotkey):
+        meter.wakeup("keyboard")
+        if self._edge(f"preset:{preset_name}", hotkey) and self.preset_cb:
             self.preset_cb(preset_name)
 
+    def _on_palette(self):
+        meter.wakeup("keyboard")
+        if self._edge("palette", self.palette_hotkey) and self.palette_cb:
+            self.palette_cb()
+
+    def _on_cycle(self, step, hotkey):
+        meter.wakeup("keyboard")
+        if self._edge(cycle_action(step), hotkey) and self.cycle_cb:
+            self.cycle_cb(step)
+
+    def _on_hold_press(self):
+        meter.wakeup("keyboard")
+        if self._holding:
+            debouncer.suppress("keyboard", "autorepeat")
+            return
+        self._holding = True
+        if self.hold_cb:
+            self.hold_cb(True)
+
+    def _end_hold(self):
+        if not self._holding:
+            return
+        self._holding = False
+        if self.hold_cb:
+            self.hold_cb(False)
+
     def update_main_hotkey(self, new_hotkey):
         if not new_hotkey: return
         self.main_hotkey = new_hotkey
@@ -57,6 +258,27 @@ class InputManager:
         self.config.save_settings()
         self.register_shortcuts()
 
+    def update_palette_hotkey(self, new_hotkey):
+        if not new_hotkey: return
+        self.palette_hotkey = new_hotkey
+        self.config.update_setting("palette_hotkey", new_hotkey)
+        self.config.save_settings()
+        self.register_shortcuts()
+
+    def update_hold_hotkey(self, new_hotkey):
+        if not new_hotkey: return
+        self.hold_hotkey = new_hotkey
+        self.config.update_setting("hold_hotkey", new_hotkey)
+        self.config.save_settings()
+        self.register_shortcuts()
+
+    def update_cycle_hotkey(self, step, new_hotkey):
+        if not new_hotkey: return
+        self.cycle_hotkeys[step] = new_hotkey
+        self.config.update_setting(CYCLE_HOTKEYS[step], new_hotkey)
+        self.config.save_settings()
+        self.register_shortcuts()
+
     def set_preset_hotkey(self, preset_name, new_hotkey):
         if preset_name in self.config.presets:
             self.config.presets[preset_name]["hotkey"] = new_hotkey
@@ -83,7 +305,7 @@ class InputManager:
         except:
             pass
 
-        threading.Thread(target=self._recording_worker, args=(callback_success,), daemon=True).start()
+        threading.Thread(target=self._recording_worker, args=(callback_success,), daemon=True, name="NVFT-keyboard-record").start()
 
     def _recording_worker(self, callback):
         pressed_keys = set()
@@ -140,7 +362,7 @@ class InputManager:
             # Validation: Block pure modifiers
             if not keys_found:
                  # User pressed only Ctrl or Alt. Invalid.
-                 print("Invalid hotkey: Modifiers only.")
+                 diag.warning("hotkeys", "Invalid hotkey: Modifiers only")
                  callback(None)
                  return
 
@@ -0,0 +1,474 @@
+"""
+Synthetic input replay harness for InputManager.
+
+Replays recorded or generated keyboard event streams into InputManager through a
+stand-in for the `keyboard` module, so hotkey handling can be stress-tested headless
+(works on Linux, no hook or root access needed).
+
+    python -m src.input_replay --stream all --combos 300 --events 20000
+    python -m src.input_replay --file recording.jsonl
+
+Recordings are JSON lines (or a JSON list) of keyboard events as produced by
+`keyboard.KeyboardEvent.to_json()`; only event_type, name and time are used.
+"""
+import argparse
+import importlib
+import json
+import queue
+import random
+import sys
+import threading
+import time
+import types
+
+KEY_DOWN = "down"
+KEY_UP = "up"
+
+MODIFIERS = ("ctrl", "shift", "alt")
+BINDABLE_KEYS = tuple(f"f{i}" for i in range(1, 13)) + tuple("1234567890") + tuple("abcdefghijklmnopqrstuvwxyz")
+# Keys a game keeps hammering that are never part of a binding in the generated streams
+GAME_KEYS = ("w", "a", "s", "d", "space", "q", "e", "r", "tab", "c")
+
+
+def normalize_key(name):
+    name = name.lower()
+    for side in ("left ", "right "):
+        if name.startswith(side) and name[len(side):] in MODIFIERS + ("windows",):
+            return name[len(side):]
+    return name
+
+
+def parse_combo(hotkey):
+    return frozenset(normalize_key(k.strip()) for k in hotkey.split("+"))
+
+
+class KeyboardEvent:
+    __slots__ = ("event_type", "name", "time", "index", "dispatched")
+
+    def __init__(self, event_type, name, time=0.0, index=-1):
+        self.event_type = event_type
+        self.name = name
+        self.time = time
+        self.index = index
+        self.dispatched = 0.0
+
+    def __repr__(self):
+        return f"KeyboardEvent({self.name} {self.event_type})"
+
+
+class FakeKeyboard(types.ModuleType):
+    """
+    Stand-in for the parts of the `keyboard` module used by InputManager.
+    Like the real library, hotkeys fire on every KEY_DOWN that leaves exactly the
+    hotkey's keys pressed (so OS autorepeat re-fires them), and callbacks run on a
+    single event-processing thread.
+    """
+    KEY_DOWN = KEY_DOWN
+    KEY_UP = KEY_UP
+
+    def __init__(self):
+        super().__init__("keyboard")
+        self._lock = threading.Lock()
+        self._hotkeys = {}  # handle -> (combo, callback)
+        self._by_combo = {}  # combo -> [handle]
+        self._next_handle = 0
+        self._release_hooks = {}  # handle -> callback
+        self._pressed = set()
+        self._events = queue.Queue()
+        self._read_events = queue.Queue()
+        self._worker = None
+        self.current_event = None
+        self.overhead = []  # Seconds spent per event outside of callbacks
+        self.queue_delay = []  # Seconds between injection and processing
+        self.callback_time = 0.0
+
+    # --- keyboard module API ---
+
+    def add_hotkey(self, hotkey, callback, suppress=False, **kwargs):
+        combo = parse_combo(hotkey)
+        with self._lock:
+            self._next_handle += 1
+            handle = self._next_handle
+            self._hotkeys[handle] = (combo, callback)
+            self._by_combo.setdefault(combo, []).append(handle)
+        return handle
+
+    def remove_hotkey(self, handle):
+        with self._lock:
+            combo, _ = self._hotkeys.pop(handle)
+            self._by_combo[combo].remove(handle)
+            if not self._by_combo[combo]:
+                del self._by_combo[combo]
+
+    def unhook_all_hotkeys(self):
+        with self._lock:
+            self._hotkeys.clear()
+            self._by_combo.clear()
+
+    def on_release(self, callback, suppress=False):
+        with self._lock:
+            self._next_handle += 1
+            handle = self._next_handle
+            self._release_hooks[handle] = callback
+        return handle
+
+    def unhook(self, handle):
+        with self._lock:
+            del self._release_hooks[handle]
+
+    def read_event(self, suppress=False):
+        return self._read_events.get()
+
+    # --- Harness side ---
+
+    @property
+    def hotkey_count(self):
+        return len(self._hotkeys)
+
+    def start(self):
+        self._worker = threading.Thread(target=self._process, daemon=True)
+        self._worker.start()
+
+    def inject(self, event):
+        event.time = time.perf_counter()
+        self._events.put(event)
+
+    def feed_read_events(self, events):
+        for e in events:
+            self._read_events.put(e)
+
+    def drain(self):
+        self._events.join()
+
+    def _process(self):
+        while True:
+            event = self._events.get()
+            t0 = event.dispatched = time.perf_counter()
+            spent = self.callback_time
+            name = normalize_key(event.name)
+            callbacks = ()
+            if event.event_type == KEY_DOWN:
+                self._pressed.add(name)
+                with self._lock:
+                    handles = self._by_combo.get(frozenset(self._pressed))
+                    if handles:
+                        callbacks = [self._hotkeys[h][1] for h in handles]
+            else:
+                self._pressed.discard(name)
+                with self._lock:
+                    callbacks = [(lambda cb=cb: cb(event)) for cb in self._release_hooks.values()]
+
+            self.queue_delay.append(t0 - event.time)
+            self.current_event = event
+            for cb in callbacks:
+                c0 = time.perf_counter()
+                try:
+                    cb()
+                except Exception as e:
+                    print(f"Hotkey callback raised: {e}")
+                self.callback_time += time.perf_counter() - c0
+            self.current_event = None
+
+            self.overhead.append((time.perf_counter() - t0) - (self.callback_time - spent))
+            self._events.task_done()
+
+
+class ReplayConfig:
+    """In-memory stand-in for ConfigManager (no files, no registry)."""
+    def __init__(self, main_hotkey, preset_hotkeys):
+        self.current_settings = {"hotkey": main_hotkey}
+        self.presets = {name: {"hotkey": hk} for name, hk in preset_hotkeys.items()}
+
+    def update_setting(self, key, value):
+        self.current_settings[key] = value
+
+    def save_settings(self):
+        pass
+
+    def save_presets(self):
+        pass
+
+
+def load_input_manager(fake):
+    """Import src.input_manager against the fake keyboard module."""
+    sys.modules["keyboard"] = fake
+    module = importlib.import_module("src.input_manager")
+    module.keyboard = fake
+    return module
+
+
+# --- Stream generators ---
+# Each returns a list of (event_type, name); timing is applied by the replayer.
+
+def make_combos(count, seed=0):
+    rng = random.Random(seed)
+    combos = set()
+    limit = (2 ** len(MODIFIERS) - 1) * len(BINDABLE_KEYS)
+    while len(combos) < min(count, limit):
+        mods = [m for m in MODIFIERS if rng.random() < 0.5] or [rng.choice(MODIFIERS)]
+        combos.add("+".join(mods + [rng.choice(BINDABLE_KEYS)]))
+    return sorted(combos)
+
+
+def _press_combo(combo, autorepeat=0):
+    keys = combo.split("+")
+    events = [(KEY_DOWN, k) for k in keys]
+    events += [(KEY_DOWN, keys[-1])] * autorepeat
+    events += [(KEY_UP, k) for k in reversed(keys)]
+    return events
+
+
+def burst_stream(combos, count, seed=0):
+    """Gaming-keyboard bursts: fast taps of unbound keys with bound combos mixed in."""
+    rng = random.Random(seed)
+    events = []
+    while len(events) < count:
+        if rng.random() < 0.1:
+            events += _press_combo(rng.choice(combos), autorepeat=rng.choice((0, 0, 0, 3)))
+        else:
+            k = rng.choice(GAME_KEYS)
+            events += [(KEY_DOWN, k), (KEY_UP, k)]
+    return events
+
+
+def held_modifier_stream(combos, count, seed=0):
+    """A modifier held for long stretches (with OS autorepeat) while other keys are tapped."""
+    rng = random.Random(seed)
+    by_mod = {}
+    for c in combos:
+        keys = c.split("+")
+        if len(keys) == 2:
+            by_mod.setdefault(keys[0], []).append(keys[1])
+    events = []
+    while len(events) < count:
+        mod = rng.choice(sorted(by_mod) or list(MODIFIERS))
+        events.append((KEY_DOWN, mod))
+        for _ in range(rng.randint(5, 40)):
+            events.append((KEY_DOWN, mod))  # Autorepeat of the held modifier
+            if by_mod.get(mod) and rng.random() < 0.3:
+                k = rng.choice(by_mod[mod])
+            else:
+                k = rng.choice(GAME_KEYS)
+            events += [(KEY_DOWN, k), (KEY_UP, k)]
+        events.append((KEY_UP, mod))
+    return events
+
+
+def rolling_stream(combos, count, seed=0):
+    """Rolling presses: the next combo starts before the previous one is fully released."""
+    rng = random.Random(seed)
+    events = []
+    while len(events) < count:
+        a = rng.choice(combos).split("+")
+        b = rng.choice(combos).split("+")
+        events += [(KEY_DOWN, k) for k in a]
+        events.append((KEY_UP, a[-1]))
+        events += [(KEY_DOWN, k) for k in b]
+        events += [(KEY_UP, k) for k in set(a[:-1]) | set(b)]
+    return events
+
+
+STREAMS = {"burst": burst_stream, "held": held_modifier_stream, "rolling": rolling_stream}
+
+
+def load_recording(path):
+    with open(path, "r") as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        records = json.loads(text)
+    else:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [(r["event_type"], r["name"]) for r in records if r.get("name")]
+
+
+def expected_triggers(events, bindings):
+    """
+    Reference model: a binding is intended once per *transition* into exactly its key set
+    (autorepeat of an already pressed key is not a new press). Returns {event index: binding}.
+    """
+    pressed = set()
+    expected = {}
+    for i, (event_type, name) in enumerate(events):
+        key = normalize_key(name)
+        if event_type == KEY_DOWN:
+            if key in pressed:
+                continue
+            pressed.add(key)
+            target = bindings.get(frozenset(pressed))
+            if target is not None:
+                expected[i] = target
+        else:
+            pressed.discard(key)
+    return expected
+
+
+# --- Replay ---
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def replay(events, main_hotkey, preset_hotkeys, rate_hz=None):
+    """
+    Replay events through a fresh InputManager. rate_hz paces injection (e.g. 1000 for a
+    1000 Hz keyboard); None injects as fast as possible. Returns a result dict.
+    The debounce window is disabled: generated streams press combos far faster than a
+    human would, and the reference model only covers edge triggering.
+    """
+    fake = FakeKeyboard()
+    module = load_input_manager(fake)
+    debouncer = importlib.import_module("src.debounce").debouncer
+    debouncer.configure(0)
+    suppressed_before = debouncer.counts()
+    observed = []  # (event index, binding, latency)
+
+    # Latency is measured from the moment the processing thread picks the event up, so an
+    # unpaced replay does not count its own queue backlog; queue delay is reported separately.
+    def toggle_cb():
+        e = fake.current_event
+        observed.append((e.index, "<toggle>", time.perf_counter() - e.dispatched))
+
+    def preset_cb(name):
+        e = fake.current_event
+        observed.append((e.index, name, time.perf_counter() - e.dispatched))
+
+    config = ReplayConfig(main_hotkey, preset_hotkeys)
+    manager = module.InputManager(config, toggle_callback=toggle_cb, preset_callback=preset_cb)
+    fake.start()
+
+    bindings = {parse_combo(main_hotkey): "<toggle>"}
+    bindings.update({parse_combo(hk): name for name, hk in preset_hotkeys.items()})
+    expected = expected_triggers(events, bindings)
+
+    interval = 1.0 / rate_hz if rate_hz else 0.0
+    start = time.perf_counter()
+    for i, (event_type, name) in enumerate(events):
+        if interval:
+            target = start + i * interval
+            while time.perf_counter() < target:
+                time.sleep(0)
+        fake.inject(KeyboardEvent(event_type, name, index=i))
+    fake.drain()
+    elapsed = time.perf_counter() - start
+
+    seen = {}
+    spurious = 0
+    for index, binding, _ in observed:
+        if expected.get(index) == binding:
+            seen[index] = seen.get(index, 0) + 1
+        else:
+            spurious += 1  # Autorepeat re-fire or a trigger nobody intended
+
+    latencies = {"toggle": [], "preset": []}
+    for _, binding, latency in observed:
+        latencies["toggle" if binding == "<toggle>" else "preset"].append(latency)
+
+    return {
+        "events": len(events),
+        "bindings": fake.hotkey_count,
+        "elapsed": elapsed,
+        "overhead": fake.overhead,
+        "queue_delay": fake.queue_delay,
+        "latency": latencies,
+        "expected": len(expected),
+        "observed": len(observed),
+        "missed": sum(1 for i in expected if i not in seen),
+        "duplicate": sum(n - 1 for n in seen.values()) + spurious,
+        "suppressed": {k: n - suppressed_before.get(k, 0) for k, n in debouncer.counts().items() if n > suppressed_before.get(k, 0)},
+        "manager": manager,
+    }
+
+
+def replay_recording_worker(sequence):
+    """Drive InputManager._recording_worker with a scripted (event_type, name) sequence."""
+    fake = FakeKeyboard()
+    module = load_input_manager(fake)
+    manager = module.InputManager(ReplayConfig(None, {}), toggle_callback=None)
+    done = threading.Event()
+    result = []
+
+    def callback(combo):
+        result.append(combo)
+        done.set()
+
+    fake.feed_read_events(KeyboardEvent(t, n) for t, n in sequence)
+    manager.record_hotkey(callback)
+    if not done.wait(2.0):
+        return "<timeout>"
+    return result[0]
+
+
+RECORDING_SCRIPTS = [
+    ("ctrl+shift+a", [(KEY_DOWN, "ctrl"), (KEY_DOWN, "shift"), (KEY_DOWN, "a"),
+                      (KEY_UP, "a"), (KEY_UP, "shift"), (KEY_UP, "ctrl")]),
+    ("ctrl+f10", [(KEY_DOWN, "right ctrl"), (KEY_DOWN, "f10"), (KEY_DOWN, "f10"), (KEY_DOWN, "f10"),
+                  (KEY_UP, "right ctrl"), (KEY_UP, "f10")]),
+    ("alt+shift+1", [(KEY_DOWN, "shift"), (KEY_DOWN, "alt"), (KEY_DOWN, "1"), (KEY_UP, "shift"),
+                     (KEY_UP, "1"), (KEY_UP, "alt")]),
+    (None, [(KEY_DOWN, "ctrl"), (KEY_DOWN, "shift"), (KEY_UP, "shift"), (KEY_UP, "ctrl")]),
+]
+
+
+def _format_us(seconds):
+    return f"{seconds * 1e6:8.1f}us"
+
+
+def print_report(label, result):
+    overhead = result["overhead"]
+    print(f"[{label}] {result['events']} events, {result['bindings']} bindings, {result['elapsed']:.3f}s")
+    print(f"  per-event overhead  mean {_format_us(sum(overhead) / max(1, len(overhead)))}"
+          f"  p99 {_format_us(_percentile(overhead, 99))}")
+    delay = result["queue_delay"]
+    print(f"  queue delay         p50 {_format_us(_percentile(delay, 50))}  p99 {_format_us(_percentile(delay, 99))}")
+    for kind, values in result["latency"].items():
+        if values:
+            print(f"  {kind:<7} latency     p50 {_format_us(_percentile(values, 50))}"
+                  f"  p99 {_format_us(_percentile(values, 99))}  max {_format_us(max(values))}  (n={len(values)})")
+    print(f"  triggers  expected {result['expected']}  observed {result['observed']}"
+          f"  missed {result['missed']}  duplicate {result['duplicate']}")
+    if result["suppressed"]:
+        print("  suppressed          " + "  ".join(f"{k} {n}" for k, n in sorted(result["suppressed"].items())))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay keyboard event streams into InputManager.")
+    parser.add_argument("--stream", choices=sorted(STREAMS) + ["all"], default="all")
+    parser.add_argument("--file", help="Replay a recorded event stream instead of a generated one")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--combos", type=int, default=300, help="Number of bound preset combos")
+    parser.add_argument("--hotkey", default="ctrl+f10", help="Main toggle hotkey")
+    parser.add_argument("--rate", type=float, default=None, help="Injection rate in Hz (default: unpaced)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    combos = [c for c in make_combos(args.combos + 1, args.seed) if parse_combo(c) != parse_combo(args.hotkey)]
+    presets = {f"preset-{i:04d}": c for i, c in enumerate(combos[:args.combos])}
+    all_combos = [args.hotkey] + list(presets.values())
+
+    if args.file:
+        streams = {args.file: load_recording(args.file)}
+    else:
+        names = sorted(STREAMS) if args.stream == "all" else [args.stream]
+        streams = {n: STREAMS[n](all_combos, args.events, args.seed) for n in names}
+
+    failures = 0
+    for label, events in streams.items():
+        result = replay(events, args.hotkey, presets, args.rate)
+        print_report(label, result)
+        failures += result["missed"] + result["duplicate"]
+
+    print("[recording]")
+    for expected, sequence in RECORDING_SCRIPTS:
+        got = replay_recording_worker(sequence)
+        status = "ok" if got == expected else "FAIL"
+        failures += got != expected
+        print(f"  {status:<4} expected {expected!r:<16} got {got!r}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+import asyncio
+import json
+import math
+import socket
+import threading
+
+from .config import RAMP_KEYS
+from .colortemp import COLOR_MODES, MIN_KELVIN, MAX_KELVIN
+from . import metrics
+from .debounce import debouncer
+from .diagnostics import diag
+
+LOCAL_PORT = 65432
+MAX_DATAGRAM = 65507
+# Events a diagnostics reply may carry: more would not fit in one datagram (the full log is on disk)
+MAX_DIAGNOSTICS_LIMIT = 100
+
+# Commands understood by the control protocol (see README for the wire format)
+# Ramp settings that can be set one value at a time (custom_ramp is a whole table)
+PARAMETER_KEYS = tuple(k for k in RAMP_KEYS if k != "custom_ramp")
+# Accepted set-parameter values (the GUI slider bounds; temperature: the white-point table)
+PARAMETER_RANGES = {
+    "brightness": (0.0, 1.0),
+    "contrast": (0.0, 1.0),
+    "gamma": (0.1, 5.0),
+    "red_scale": (0.0, 2.0),
+    "green_scale": (0.0, 2.0),
+    "blue_scale": (0.0, 2.0),
+    "temperature": (MIN_KELVIN, MAX_KELVIN),
+}
+COMMANDS = ("on", "off", "toggle", "load-preset", "next", "prev", "set-parameter", "status", "profile", "profile-stop", "stats", "diagnostics", "batch")
+
+
+class ProtocolError(Exception):
+    def __init__(self, message, request_id=None):
+        super().__init__(message)
+        self.request_id = request_id
+
+
+def try_send_toggle():
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.settimeout(0.1)
+        sock.sendto(b"TOGGLE", ("127.0.0.1", LOCAL_PORT))
+        sock.close()
+    except Exception:
+        pass
+
+
+def send_cli_command(args):
+    """
+    Forward a command line to the running instance, e.g. `NVFT.exe load-preset Night`.
+    No arguments keeps the historical behaviour (toggle).
+    """
+    if not args:
+        try_send_toggle()
+        return
+    op = args[0].lower()
+    request = {"cmd": op}
+    if op == "load-preset" and len(args) > 1:
+        request["name"] = " ".join(args[1:])
+    elif op == "set-parameter" and len(args) > 2:
+        request["key"], request["value"] = args[1], args[2]
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.settimeout(0.1)
+        sock.sendto(json.dumps(request).encode("utf-8"), ("127.0.0.1", LOCAL_PORT))
+        sock.close()
+    except Exception:
+        pass
+
+
+class ControlClient:
+    """
+    Minimal client for scripts: keeps one socket open and waits for the matching reply.
+    Usage: ControlClient().send("load-preset", name="Night")
+    """
+    def __init__(self, port=LOCAL_PORT, timeout=1.0):
+        self.addr = ("127.0.0.1", port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.settimeout(timeout)
+        self._next_id = 0
+
+    def send(self, cmd, **args):
+        self._next_id += 1
+        request = {"id": self._next_id, "cmd": cmd}
+        request.update(args)
+        self.sock.sendto(json.dumps(request).encode("utf-8"), self.addr)
+        while True:
+            data, _ = self.sock.recvfrom(MAX_DATAGRAM)
+            reply = json.loads(data)
+            if reply.get("id") == self._next_id:
+                return reply
+
+    def batch(self, commands):
+        return self.send("batch", commands=commands)
+
+    def close(self):
+        self.sock.close()
+
+
+def _validate(command):
+    if not isinstance(command, dict):
+        raise ProtocolError("command must be an object")
+    op = command.get("cmd")
+    if op not in COMMANDS or op == "batch":
+        raise ProtocolError(f"unknown command: {op!r}")
+    if op == "load-preset" and not isinstance(command.get("name"), str):
+        raise ProtocolError("load-preset requires 'name'")
+    if op == "set-parameter":
+        if command.get("key") not in PARAMETER_KEYS:
+            raise ProtocolError(f"set-parameter 'key' must be one of {', '.join(PARAMETER_KEYS)}")
+        if command["key"] == "color_mode":
+            if command.get("value") not in COLOR_MODES:
+                raise ProtocolError(f"color_mode must be one of {', '.join(COLOR_MODES)}")
+        else:
+            try:
+                value = float(command.get("value"))
+            except (TypeError, ValueError):
+                raise ProtocolError("set-parameter requires a numeric 'value'")
+            # NaN/inf would end up in settings.json (a NaN brightness blacks out the screen)
+            lo, hi = PARAMETER_RANGES[command["key"]]
+            if not math.isfinite(value) or not lo <= value <= hi:
+                raise ProtocolError(f"{command['key']} must be between {lo:g} and {hi:g}")
+    if op == "diagnostics":
+        limit = command.get("limit", 50)
+        if not isinstance(limit, int) or isinstance(limit, bool) or not 0 <= limit <= MAX_DIAGNOSTICS_LIMIT:
+            raise ProtocolError(f"diagnostics 'limit' must be an integer between 0 and {MAX_DIAGNOSTICS_LIMIT}")
+    if op == "profile":
+        try:
+            if float(command.get("seconds", 30)) <= 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ProtocolError("profile 'seconds' must be a positive number")
+    return command
+
+
+def parse_request(data):
+    """Turn a datagram into (request_id, [commands]). Raises ProtocolError."""
+    # Legacy datagram sent by try_send_toggle / older builds
+    if data == b"TOGGLE":
+        return None, [{"cmd": "toggle"}]
+
+    try:
+        request = json.loads(data)
+    except (UnicodeDecodeError, ValueError):
+        raise ProtocolError("malformed request")
+    if not isinstance(request, dict):
+        raise ProtocolError("request must be an object")
+
+    request_id = request.get("id")
+    try:
+        if request.get("cmd") == "batch":
+            commands = request.get("commands")
+            if not isinstance(commands, list) or not commands:
+                raise ProtocolError("batch requires a non-empty 'commands' list")
+        else:
+            commands = [request]
+        return request_id, [_validate(c) for c in commands]
+    except ProtocolError as e:
+        e.request_id = request_id
+        raise
+
+
+def check_commands(app, commands):
+    """
+    Check the parts of a batch that depend on app state (preset names, playlist, profiler)
+    before anything runs, so a batch is either applied in full or not at all.
+    """
+    for index, command in enumerate(commands):
+        op = command["cmd"]
+        if op == "load-preset" and command["name"] not in app.config.presets:
+            raise ProtocolError(f"command {index}: unknown preset {command['name']!r}")
+        if op in ("next", "prev") and not app.config.playlist():
+            raise ProtocolError(f"command {index}: playlist is empty")
+        if op == "profile" and app.profiler is None:
+            raise ProtocolError(f"command {index}: profiler unavailable")
+
+
+def execute_commands(app, commands):
+    """
+    Run a validated command sequence on the UI thread.
+    Filter state and parameters are only staged while iterating; the ramp is applied
+    (or restored) once at the end, so a batch costs a single upload.
+    """
+    check_commands(app, commands)
+    want_active = app.gamma.active
+    dirty = False
+    results = []
+    status_slots = []
+
+    for command in commands:
+        op = command["cmd"]
+        if op == "on":
+            want_active = True
+        elif op == "off":
+            want_active = False
+        elif op == "toggle":
+            want_active = not want_active
+        elif op == "load-preset":
+            app.load_preset(command["name"], apply=False)
+            dirty = True
+        elif op in ("next", "prev"):
+            # A lone next/prev applies itself (one upload of the prefetched ramp); in a batch it is staged
+            alone = len(commands) == 1
+            name = app.cycle_preset(1 if op == "next" else -1, apply=alone)
+            dirty = dirty or not alone
+            results.append(name)
+            continue
+        elif op == "set-parameter":
+            value = command["value"] if command["key"] == "color_mode" else float(command["value"])
+            app.set_parameter(command["key"], value)
+            dirty = True
+        elif op == "status":
+            # Filled in after the final apply so the reply reflects the end state
+            status_slots.append(len(results))
+        elif op == "profile":
+            # Output path prefix, or None if a capture is already running
+            results.append(app.profiler.start(float(command.get("seconds", 30))))
+            continue
+        elif op == "stats":
+            results.append(metrics.report())
+            continue
+        elif op == "diagnostics":
+            # Writes the ring buffer to the log file; the reply carries only the newest events
+            events = diag.recent(command.get("limit", 50))
+            fitted = _fit_events(events)
+            results.append({"path": diag.dump(), "events": fitted, "omitted": len(events) - len(fitted)})
+            continue
+        elif op == "profile-stop":
+            if app.profiler is not None:
+                app.profiler.stop()
+        results.append(None)
+
+    if want_active and (dirty or not app.gamma.active):
+        app.gamma.apply_settings(app.config.snapshot)
+    else:
+        if not want_active and app.gamma.active:
+            app.gamma.restore()
+        if dirty and app.config.current_settings.get("hold_hotkey"):
+            app.gamma.stage(app.config.snapshot)
+    app.update_status_visuals()
+    if dirty:
+        app.config.save_settings()
+
+    for slot in status_slots:
+        results[slot] = app.get_status()
+    return results
+
+
+def _fit_events(events, budget=MAX_DATAGRAM - 1024):
+    """Drop the oldest events until the rest encodes within budget (a reply is one datagram)."""
+    sizes = [len(json.dumps(e)) + 2 for e in events]
+    total = sum(sizes)
+    start = 0
+    while total > budget and start < len(events):
+        total -= sizes[start]
+        start += 1
+    return events[start:]
+
+
+def _debounce_action(commands):
+    """
+    Debounce key for a lone toggle / load-preset / next / prev command (same keys as the hotkeys), else None.
+    Multi-command batches are deliberate sequences and are never debounced.
+    """
+    if len(commands) != 1:
+        return None
+    op = commands[0]["cmd"]
+    if op == "toggle":
+        return "toggle"
+    if op == "load-preset":
+        return f"preset:{commands[0]['name']}"
+    if op in ("next", "prev"):
+        return f"cycle:{op}"
+    return None
+
+
+class _ControlProtocol(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        metrics.meter.wakeup("ipc")
+        asyncio.ensure_future(self.server.handle(data, addr, self.transport))
+
+    def error_received(self, exc):
+        # e.g. a reply the OS refused to send
+        diag.warning("ipc", "IPC send failed", error=exc)
+
+
+class ControlServer:
+    """Local UDP control protocol served by an asyncio loop on a background thread."""
+    def __init__(self, app, port=LOCAL_PORT):
+        self.app = app
+        self.port = port
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True, name="NVFT-ipc").start()
+
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except OSError:
+            # Port busy (maybe another app?). We just silently fail listening feature
+            # but allow the app to run normally (unlike original behavior).
+            diag.warning("ipc", "IPC port busy, remote control disabled", port=self.port)
+        except Exception as e:
+            diag.error("ipc", "IPC error", error=e)
+
+    async def _serve(self):
+        loop = asyncio.get_running_loop()
+        # Bind only to localhost to match original and be safer
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _ControlProtocol(self), local_addr=("127.0.0.1", self.port)
+        )
+        try:
+            await loop.create_future()  # Serve forever
+        finally:
+            transport.close()
+
+    async def handle(self, data, addr, transport):
+        request_id = None
+        try:
+            request_id, commands = parse_request(data)
+            action = _debounce_action(commands)
+            if action is not None and not debouncer.allow(action, "ipc"):
+                # Dropped before touching the UI thread (e.g. a Stream Deck button hammered)
+                reply = {"id": request_id, "ok": True, "result": None, "debounced": True}
+            else:
+                future = self.app.call_in_ui(lambda: execute_commands(self.app, commands))
+                results = await asyncio.wrap_future(future)
+                reply = {"id": request_id, "ok": True, "result": results if len(results) > 1 else results[0]}
+        except ProtocolError as e:
+            reply = {"id": e.request_id if request_id is None else request_id, "ok": False, "error": str(e)}
+        except Exception as e:
+            diag.error("ipc", "IPC error", error=e)
+            reply = {"id": request_id, "ok": False, "error": "internal error"}
+
+        # The legacy TOGGLE datagram expects no reply
+        if data != b"TOGGLE":
+            encoded = json.dumps(reply).encode("utf-8")
+            if len(encoded) > MAX_DATAGRAM:
+                # A reply has to fit one datagram; say so instead of leaving the client to time out
+                diag.warning("ipc", "IPC reply too large", size=len(encoded))
+                encoded = json.dumps({"id": reply["id"], "ok": False, "error": f"reply too large ({len(encoded)} bytes)"}).encode("utf-8")
+            transport.sendto(encoded, addr)
+
+
+def start_ipc_listener(app):
+    ControlServer(app).start()
+
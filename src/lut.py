@@ -0,0 +1,258 @@
+"""
+Import .cube (1D/3D, optional shaper) and .spi1d LUTs as presets.
+
+The display API only takes one curve per channel, so 3D LUTs are reduced to the
+least-squares best per-channel curves (each output channel as a function of its own input
+channel, averaged over the other two) and the approximation error is reported.
+The result is stored in the preset as a ready-made 256-entry ramp ("custom_ramp"),
+applied as-is without recomputation.
+
+    python -m src.lut grade.cube --name "Film Look"
+
+Data is parsed in chunks with numpy's C number parser, so a 65^3 cube imports in a
+fraction of a second.
+"""
+import argparse
+import os
+import re
+import sys
+
+import numpy as np
+
+from .ramp import RAMP_SIZE
+
+CHUNK_CHARS = 4 * 1024 * 1024
+# Anything but numbers, whitespace and exponents: a chunk with these needs line filtering
+_NON_NUMERIC = re.compile(r"[^0-9eE+\-.\s]")
+# .cube header keywords understood (Adobe spec plus Resolve's input ranges); anything else is
+# reported rather than ignored, since it may change how the data has to be read
+CUBE_KEYWORDS = {"TITLE", "LUT_1D_SIZE", "LUT_3D_SIZE", "DOMAIN_MIN", "DOMAIN_MAX", "LUT_1D_INPUT_RANGE", "LUT_3D_INPUT_RANGE"}
+
+
+class LutError(ValueError):
+    pass
+
+
+class Lut:
+    """
+    Parsed LUT. curves: (N1, 3) 1D table or None; cube: (N, N, N, 3) indexed [b, g, r] or None.
+    When both are present the 1D table is a shaper applied before the cube.
+    domain_min/max is the input range of the first table; cube_min/max the input range of the
+    cube when it follows a shaper.
+    """
+    def __init__(self, curves=None, cube=None, domain_min=(0.0, 0.0, 0.0), domain_max=(1.0, 1.0, 1.0), title="",
+                 cube_min=(0.0, 0.0, 0.0), cube_max=(1.0, 1.0, 1.0)):
+        self.curves = curves
+        self.cube = cube
+        self.domain_min = np.asarray(domain_min, dtype=np.float64)
+        self.domain_max = np.asarray(domain_max, dtype=np.float64)
+        self.cube_min = np.asarray(cube_min, dtype=np.float64)
+        self.cube_max = np.asarray(cube_max, dtype=np.float64)
+        self.title = title
+
+
+def _parse_numbers(text):
+    if _NON_NUMERIC.search(text):
+        # Comments or stray keywords between data lines
+        lines = [l for l in text.splitlines() if l.strip() and not _NON_NUMERIC.search(l)]
+        text = "\n".join(lines)
+    return np.fromstring(text, dtype=np.float64, sep=" ")
+
+
+def _read_data(f, first_line, count):
+    """Read exactly `count` numbers following the header, one chunk at a time."""
+    data = np.empty(count, dtype=np.float64)
+    pos = 0
+    pending = first_line
+    while pos < count:
+        block = f.read(CHUNK_CHARS)
+        if block:
+            # Only parse complete lines; the partial last one is carried over
+            cut = block.rfind("\n")
+            if cut < 0:
+                pending += block
+                continue
+            text, pending = pending + block[:cut], block[cut + 1:]
+        else:
+            text, pending = pending, ""
+        values = _parse_numbers(text)
+        take = min(len(values), count - pos)
+        data[pos:pos + take] = values[:take]
+        pos += take
+        if not block:
+            break
+    if pos < count:
+        raise LutError(f"expected {count} values, found {pos}")
+    return data
+
+
+def _floats(header, key, count):
+    try:
+        values = [float(v) for v in header[key].split()]
+    except ValueError:
+        values = []
+    if len(values) != count:
+        raise LutError(f"{key} needs {count} numbers: {header[key]!r}")
+    return values
+
+
+def _input_range(header, key):
+    lo, hi = _floats(header, key, 2)
+    return (lo,) * 3, (hi,) * 3
+
+
+def parse_cube(path):
+    header = {}
+    first = ""
+    with open(path, "r") as f:
+        for line in f:
+            s = line.strip()
+            if not s or s.startswith("#"):
+                continue
+            if s[0] in "+-.0123456789":
+                first = s + "\n"
+                break
+            key, _, value = s.partition(" ")
+            header[key.upper()] = value.strip()
+
+        unknown = sorted(set(header) - CUBE_KEYWORDS)
+        if unknown:
+            raise LutError(f"unsupported keyword(s): {', '.join(unknown)}")
+        size1 = int(header.get("LUT_1D_SIZE", 0))
+        size3 = int(header.get("LUT_3D_SIZE", 0))
+        if not size1 and not size3:
+            raise LutError("missing LUT_1D_SIZE / LUT_3D_SIZE")
+        data = _read_data(f, first, (size1 + size3 ** 3) * 3).reshape(-1, 3)
+
+    range1 = _input_range(header, "LUT_1D_INPUT_RANGE") if "LUT_1D_INPUT_RANGE" in header else None
+    range3 = _input_range(header, "LUT_3D_INPUT_RANGE") if "LUT_3D_INPUT_RANGE" in header else None
+    if range1 and not size1 or range3 and not size3:
+        raise LutError("input range given for a table the file does not have")
+    # The first table's input range: LUT_nD_INPUT_RANGE (Resolve) or DOMAIN_MIN/MAX (Adobe)
+    first_range = range1 if size1 else range3
+    if "DOMAIN_MIN" in header or "DOMAIN_MAX" in header:
+        if first_range:
+            raise LutError("both an input range and DOMAIN_MIN/DOMAIN_MAX given")
+        first_range = (_floats(header, "DOMAIN_MIN", 3) if "DOMAIN_MIN" in header else (0.0,) * 3,
+                       _floats(header, "DOMAIN_MAX", 3) if "DOMAIN_MAX" in header else (1.0,) * 3)
+    domain_min, domain_max = first_range or ((0.0,) * 3, (1.0,) * 3)
+    # Behind a shaper the cube keeps its own range (0..1 unless declared)
+    cube_min, cube_max = range3 if size1 and range3 else ((0.0,) * 3, (1.0,) * 3)
+
+    curves = data[:size1] if size1 else None
+    # Red varies fastest in .cube files, so the reshape gives [b, g, r]
+    cube = data[size1:].reshape(size3, size3, size3, 3) if size3 else None
+    return Lut(curves, cube, domain_min, domain_max, header.get("TITLE", "").strip('"'), cube_min, cube_max)
+
+
+def parse_spi1d(path):
+    header = {}
+    with open(path, "r") as f:
+        for line in f:
+            s = line.strip()
+            if s.startswith("{"):
+                break
+            key, _, value = s.partition(" ")
+            if key:
+                header[key.lower()] = value.strip()
+        length = int(header.get("length", 0))
+        components = int(header.get("components", 1))
+        if not length:
+            raise LutError("missing Length")
+        data = _read_data(f, "", length * components).reshape(length, components)
+
+    lo, hi = (float(v) for v in header.get("from", "0 1").split())
+    curves = np.repeat(data, 3, axis=1) if components == 1 else data[:, :3]
+    return Lut(curves, None, (lo,) * 3, (hi,) * 3)
+
+
+def load_lut(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".cube":
+        return parse_cube(path)
+    if ext == ".spi1d":
+        return parse_spi1d(path)
+    raise LutError(f"unsupported LUT format: {ext or path}")
+
+
+def _sample(curve, x, lo, hi):
+    """Evaluate a uniformly sampled curve over [lo, hi] at x (clamped at the ends)."""
+    grid = np.linspace(lo, hi, len(curve))
+    return np.interp(x, grid, curve)
+
+
+def reduce_lut(lut):
+    """
+    Per-channel 256-entry curves (3, 256) in 0..1, plus (rms, max) error in 8-bit levels of
+    the separable approximation over the LUT's own grid (0 for pure 1D LUTs).
+    """
+    levels = np.arange(RAMP_SIZE, dtype=np.float64) / (RAMP_SIZE - 1)
+    # A display level is the LUT input value itself; _sample clamps it to the table's range
+    x = [levels] * 3
+    rms = peak = 0.0
+
+    if lut.cube is not None:
+        cube = lut.cube
+        # Least-squares curve for each output channel as a function of its own input
+        fitted = (cube[..., 0].mean(axis=(0, 1)), cube[..., 1].mean(axis=(0, 2)), cube[..., 2].mean(axis=(1, 2)))
+        residual = np.empty_like(cube)
+        np.subtract(cube[..., 0], fitted[0][None, None, :], out=residual[..., 0])
+        np.subtract(cube[..., 1], fitted[1][None, :, None], out=residual[..., 1])
+        np.subtract(cube[..., 2], fitted[2][:, None, None], out=residual[..., 2])
+        rms = float(np.sqrt(np.mean(residual * residual)) * 255.0)
+        peak = float(np.abs(residual).max() * 255.0)
+
+        if lut.curves is not None:
+            # Shaper first: map each level through the 1D table into the cube's input range
+            x = [_sample(lut.curves[:, c], x[c], lut.domain_min[c], lut.domain_max[c]) for c in range(3)]
+            out = [_sample(fitted[c], x[c], lut.cube_min[c], lut.cube_max[c]) for c in range(3)]
+        else:
+            out = [_sample(fitted[c], x[c], lut.domain_min[c], lut.domain_max[c]) for c in range(3)]
+    else:
+        out = [_sample(lut.curves[:, c], x[c], lut.domain_min[c], lut.domain_max[c]) for c in range(3)]
+
+    return np.clip(np.array(out), 0.0, 1.0), rms, peak
+
+
+def to_ramp(curves):
+    """(3, 256) curves in 0..1 -> [[red], [green], [blue]] 16-bit lists (the preset's custom_ramp)."""
+    return np.rint(curves * 65535.0).astype(np.uint16).tolist()
+
+
+def import_lut(path):
+    """Returns (custom_ramp, rms error, max error); errors are in 8-bit levels."""
+    curves, rms, peak = reduce_lut(load_lut(path))
+    return to_ramp(curves), rms, peak
+
+
+def lut_preset_values(config, ramp):
+    """Preset values for an imported ramp: default slider values plus the ramp itself."""
+    from .config import RAMP_KEYS
+    values = {k: config.default_settings.get(k) for k in RAMP_KEYS}
+    values["custom_ramp"] = ramp
+    return values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import a .cube / .spi1d LUT as an NVFT preset.")
+    parser.add_argument("lut", help="LUT file")
+    parser.add_argument("--name", help="Preset name (default: file name)")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the approximation error")
+    args = parser.parse_args(argv)
+
+    ramp, rms, peak = import_lut(args.lut)
+    print(f"Per-channel approximation error: RMS {rms:.2f}, max {peak:.2f} levels (0-255)")
+    if args.dry_run:
+        return 0
+
+    name = args.name or os.path.splitext(os.path.basename(args.lut))[0]
+    # Imported here: ConfigManager needs Windows (registry, %LOCALAPPDATA%)
+    from .config import ConfigManager
+    config = ConfigManager()
+    config.save_preset(name, lut_preset_values(config, ramp))
+    print(f"Saved preset '{name}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
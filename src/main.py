@@ -9,6 +9,15 @@ from .config import ConfigManager
 from .gamma import GammaController
 from .input_manager import InputManager
 from .gui import SettingsApp
+from .config_watcher import ConfigWatcher
+from .ipc import send_cli_command, start_ipc_listener
+from .profiler import ProfilerCapture, DEFAULT_SECONDS
+from .startup import StartupGraph, Deferred
+from .metrics import meter
+from .debounce import debouncer
+from .diagnostics import diag
+from .scheduler import Scheduler
+from .time_events import TimeChangeListener
 
 def create_tray_icon():
     # Try loading from file or create programmatically
@@ -23,81 +32,101 @@ def create_tray_icon():
     d.rectangle([20, 20, 44, 44], fill=(255, 255, 255))
     return img
 
-import socket
-
-LOCAL_PORT = 65432
-
-def try_send_toggle():
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(0.1)
-        sock.sendto(b"TOGGLE", ("127.0.0.1", LOCAL_PORT))
-        sock.close()
-    except Exception:
-        pass
-
-def start_ipc_listener(app):
-    def server():
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        try:
-            # Bind only to localhost to match original and be safer
-            sock.bind(("127.0.0.1", LOCAL_PORT))
-            while True:
-                data, _ = sock.recvfrom(1024)
-                if data == b"TOGGLE":
-                    # Run on main thread
-                    app.external_toggle()
-        except OSError:
-            # Port busy (maybe another app?). We just silently fail listening feature
-            # but allow the app to run normally (unlike original behavior).
-            print(f"IPC Port {LOCAL_PORT} busy. Remote toggle disabled.")
-        except Exception as e:
-            print(f"IPC Error: {e}")
-            
-    t = threading.Thread(target=server, daemon=True)
-    t.start()
-
 def main():
     # 1. Single Instance Check
     instance = SingleInstance()
     if instance.check():
-        # Already running? Send toggle command then exit
-        try_send_toggle()
+        # Already running? Forward the command (toggle by default) then exit
+        send_cli_command(sys.argv[1:])
         sys.exit(0)
 
-    # 2. Initialize Components
-    config = ConfigManager()
-    gamma = GammaController()
-    
-    # 3. Initialize GUI (Hidden initially if needed, but usually we show it on start unless args say min)
-    app = SettingsApp(config, gamma, None) 
-    
-    # 4. Initialize Input Manager
-    input_mgr = InputManager(
-        config, 
-        toggle_callback=app.external_toggle,
-        preset_callback=app.external_load_preset
-    )
-    app.input_manager = input_mgr # Link back
+    # 2. Startup graph: independent steps run concurrently on worker threads.
+    #    Hotkeys and tray go live as soon as their own inputs are ready; their actions are
+    #    queued on `app_proxy` until the GUI (which must be built on this thread) exists.
+    config = ConfigManager(load=False)
+    # Diagnostics go to a rotating file in the logs folder (events logged before are kept)
+    diag.attach(config.logs_dir)
+    diag.info("app", "starting", args=" ".join(sys.argv[1:]))
+    gamma = GammaController(capture=False)
+    app_proxy = Deferred()
+    profiler = ProfilerCapture(config.logs_dir, on_finished=lambda path: tray_icon.update_menu())
 
-    # 5. Start IPC Listener (New Feature)
-    start_ipc_listener(app)
+    graph = StartupGraph()
+    graph.add("migrate", config._migrate_old_config)
+    graph.add("settings", config.load_settings, deps=("migrate",))
+    graph.add("presets", config.load_presets, deps=("migrate",))
+    graph.add("autostart", config.sync_autostart_registry, deps=("settings",))
+    graph.add("gamma", gamma.capture_original)
+    graph.add("tray_image", create_tray_icon)
+    # Debounce window shared by hotkeys and IPC
+    graph.add("debounce", lambda: debouncer.configure(config.current_settings.get("debounce_ms")), deps=("settings",))
+    # Hold-to-activate needs the ramp staged before the first press
+    graph.add("stage_hold", lambda: gamma.stage(config.snapshot), deps=("settings", "gamma"))
+
+    # 3. Input Manager (hotkeys)
+    def on_hold(pressed):
+        # Runs on the keyboard thread: one upload of a staged ramp, the GUI only updates its badge
+        changed = gamma.hold_begin() if pressed else gamma.hold_end()
+        diag.info("gamma", "hold", pressed=pressed, active=gamma.active)
+        if changed:
+            app_proxy.call("external_status_changed")
 
-    # 6. Tray Icon
+    def create_input_manager():
+        return InputManager(
+            config, 
+            toggle_callback=app_proxy.method("external_toggle"),
+            preset_callback=app_proxy.method("external_load_preset"),
+            palette_callback=app_proxy.method("external_quick_switch"),
+            hold_callback=on_hold,
+            cycle_callback=app_proxy.method("external_cycle")
+        )
+
+    graph.add("hotkeys", create_input_manager, deps=("settings", "presets", "stage_hold", "debounce"))
+
+    # 4. Tray Icon
     def on_open(icon, item):
-        app.show_window()
+        meter.wakeup("tray")
+        app_proxy.call("show_window")
+
+    def on_quick_switch(icon, item):
+        meter.wakeup("tray")
+        app_proxy.call("external_quick_switch")
+
+    def on_profile(icon, item):
+        meter.wakeup("tray")
+        # Profiler (idle until a capture is requested from the tray or IPC)
+        if profiler.running:
+            profiler.stop()
+        else:
+            profiler.start(DEFAULT_SECONDS)
+        icon.update_menu()
+
+    def on_diagnostics(icon, item):
+        meter.wakeup("tray")
+        diag.dump()
+
+    def profile_label(item):
+        return "Stop Profiling" if profiler.running else f"Capture Profile ({DEFAULT_SECONDS}s)"
 
     def on_exit(icon, item):
+        meter.wakeup("tray")
+        graph.result("settings")
         config.save_settings()
+        graph.result("gamma")
         gamma.restore()
         icon.stop()
+        # os._exit skips atexit handlers
+        diag.flush()
         os._exit(0)
 
     tray_icon = pystray.Icon(
         "NVFT",
-        create_tray_icon(),
+        graph.result("tray_image"),
         menu=pystray.Menu(
             pystray.MenuItem("Settings", on_open, default=True),
+            pystray.MenuItem("Quick Switch", on_quick_switch),
+            pystray.MenuItem(profile_label, on_profile),
+            pystray.MenuItem("Save Diagnostics", on_diagnostics),
             pystray.MenuItem("Exit", on_exit)
         )
     )
@@ -105,10 +134,31 @@ def main():
     def tray_thread():
         tray_icon.run()
     
-    threading.Thread(target=tray_thread, daemon=True).start()
+    threading.Thread(target=tray_thread, daemon=True, name="NVFT-tray").start()
+
+    # 5. Initialize GUI on the main thread once its inputs are loaded
+    graph.result("settings")
+    graph.result("presets")
+    graph.result("gamma")
+    app = SettingsApp(config, gamma, None) 
+    app.profiler = profiler
+    app.input_manager = graph.result("hotkeys") # Link back
+    app_proxy.bind(app)
+
+    # 6. Start IPC Listener (local control protocol) and hot reload of files edited by other tools
+    start_ipc_listener(app)
+    ConfigWatcher(config.app_dir, app.external_config_reload).start()
+    graph.shutdown()
+
+    # 7. Time-of-day schedule: presets go through the same path as a click in the GUI
+    scheduler = Scheduler(app.external_load_preset)
+    scheduler.set_schedule(config.current_settings.get("schedule"))
+    scheduler.start()
+    app.scheduler = scheduler
+    TimeChangeListener(scheduler.recheck).start()
 
-    # 7. Run App
-    app.withdraw()
+    # 8. Run App (starts hidden, in idle mode)
+    app.hide_window()
     
     try:
         app.mainloop()
@@ -0,0 +1,106 @@
+import ctypes
+import os
+import sys
+import threading
+import time
+from .debounce import debouncer
+
+# Components wakeups and threads are attributed to
+COMPONENTS = ("tk", "tray", "ipc", "keyboard", "watcher", "profiler", "startup", "diagnostics", "scheduler", "other")
+
+
+class WakeupMeter:
+    """
+    Counts wakeups (callbacks that ran) per component.
+    wakeup() is a dict get/set on the hot path; rates are only computed when report() is called.
+    """
+    def __init__(self):
+        self._counts = {}
+        self._last_time = time.monotonic()
+        self._last_counts = {}
+
+    def wakeup(self, component):
+        self._counts[component] = self._counts.get(component, 0) + 1
+
+    def rates(self):
+        """Wakeups per second for each component since the previous call."""
+        now = time.monotonic()
+        counts = dict(self._counts)
+        elapsed = max(1e-6, now - self._last_time)
+        rates = {c: (n - self._last_counts.get(c, 0)) / elapsed for c, n in counts.items()}
+        self._last_time = now
+        self._last_counts = counts
+        return rates, counts
+
+
+meter = WakeupMeter()
+
+
+def thread_component(thread):
+    """Map a thread to a component: our threads are named 'NVFT-<component>'."""
+    if thread is threading.main_thread():
+        return "tk"
+    if thread.name.startswith("NVFT-"):
+        component = thread.name[5:].split("-")[0]
+        return component if component in COMPONENTS else "other"
+    target = getattr(thread, "_target", None)
+    module = getattr(target, "__module__", "") or ""
+    if module.startswith("keyboard"):
+        return "keyboard"
+    if module.startswith("pystray"):
+        return "tray"
+    return "other"
+
+
+class _PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+    _fields_ = [
+        ("cb", ctypes.c_uint32),
+        ("PageFaultCount", ctypes.c_uint32),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+        ("PagefileUsage", ctypes.c_size_t),
+        ("PeakPagefileUsage", ctypes.c_size_t),
+    ]
+
+
+def process_rss():
+    """Resident set size of this process in bytes (working set on Windows), or None."""
+    try:
+        if sys.platform == "win32":
+            counters = _PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return None
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def report():
+    """
+    Per-component wakeups/s (since the last report), total wakeups and thread count, plus the
+    process RSS and the events dropped by debouncing (autorepeat, repeats within the window).
+    Memory is process-wide: Python cannot attribute RSS to individual threads.
+    """
+    rates, counts = meter.rates()
+    threads = {}
+    for t in threading.enumerate():
+        c = thread_component(t)
+        threads[c] = threads.get(c, 0) + 1
+
+    components = {}
+    for c in COMPONENTS:
+        if c in counts or c in threads:
+            components[c] = {
+                "wakeups_per_sec": round(rates.get(c, 0.0), 3),
+                "wakeups": counts.get(c, 0),
+                "threads": threads.get(c, 0),
+            }
+    return {"components": components, "threads": threading.active_count(), "rss": process_rss(), "suppressed": debouncer.counts()}
@@ -0,0 +1,164 @@
+import bisect
+import heapq
+from itertools import islice
+
+DEFAULT_LIMIT = 8
+# Bigrams shared by more names than this are skipped for candidate counting
+COMMON_BIGRAM_LIMIT = 5000
+# Names the substring scan and the fuzzy ranking look at per query, whatever the library size
+MAX_CANDIDATES = 1500
+
+
+def _bigrams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _subsequence_gaps(query, text):
+    """Number of skipped characters when matching query as a subsequence of text, or None."""
+    pos = text.find(query[0])
+    if pos < 0:
+        return None
+    gaps = 0
+    for ch in query[1:]:
+        nxt = text.find(ch, pos + 1)
+        if nxt < 0:
+            return None
+        gaps += nxt - pos - 1
+        pos = nxt
+    return gaps
+
+
+class PresetIndex:
+    """
+    Search index over preset names, maintained incrementally.
+    - sorted name list (for get_preset_names) and sorted lowercase list (for prefix search via bisect)
+    - bigram -> names inverted index (candidate filtering for fuzzy search)
+    add/remove/rename are O(log n + len(name)) plus the list insert; nothing is ever rebuilt.
+    """
+    def __init__(self, names=()):
+        names = sorted(set(names))
+        self._names = names
+        self._lower = {n: n.lower() for n in names}
+        self._prefix = sorted((low, n) for n, low in self._lower.items())
+        self._grams = {}
+        for n, low in self._lower.items():
+            for g in _bigrams(low):
+                self._grams.setdefault(g, set()).add(n)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._lower
+
+    def names(self, limit=None):
+        return self._names[:limit]
+
+    def add(self, name):
+        if name in self._lower:
+            return
+        low = name.lower()
+        self._lower[name] = low
+        bisect.insort(self._names, name)
+        bisect.insort(self._prefix, (low, name))
+        for g in _bigrams(low):
+            self._grams.setdefault(g, set()).add(name)
+
+    def remove(self, name):
+        low = self._lower.pop(name, None)
+        if low is None:
+            return
+        del self._names[bisect.bisect_left(self._names, name)]
+        del self._prefix[bisect.bisect_left(self._prefix, (low, name))]
+        for g in _bigrams(low):
+            bucket = self._grams.get(g)
+            if bucket is not None:
+                bucket.discard(name)
+                if not bucket:
+                    del self._grams[g]
+
+    def rename(self, old_name, new_name):
+        self.remove(old_name)
+        self.add(new_name)
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """
+        Best matches for query: prefix matches first (alphabetical), then substring,
+        then fuzzy (ranked by subsequence gaps and shared bigrams).
+        """
+        q = query.strip().lower()
+        if not q:
+            return self._names[:limit]
+
+        # 1. Prefix range via bisect
+        lo = bisect.bisect_left(self._prefix, (q,))
+        hi = bisect.bisect_left(self._prefix, (q + "￿",))
+        results = [n for _, n in self._prefix[lo:min(hi, lo + limit)]]
+        if len(results) >= limit:
+            return results
+
+        seen = set(results)
+        if len(q) < 2:
+            # No bigrams to filter with: plain substring matches, then (for a rare character
+            # the capped scan misses) names from the buckets of bigrams containing it
+            if not self._scan(q, results, seen, limit):
+                found = set()
+                for g, bucket in self._grams.items():
+                    if q in g:
+                        found.update(n for n in islice(bucket, limit) if n not in seen)
+                results.extend(sorted(found)[:limit - len(results)])
+            return results
+
+        buckets = sorted((b for b in (self._grams.get(g) for g in _bigrams(q)) if b), key=len)
+        if not buckets:
+            return results
+        rare = [b for b in buckets if len(b) <= COMMON_BIGRAM_LIMIT]
+
+        if not rare:
+            # Every bigram is common: substring matches are likely plentiful, so an ordered
+            # scan usually fills the list. Otherwise fall back to the two smallest buckets.
+            if self._scan(q, results, seen, limit):
+                return results
+            rare = buckets[:2]
+            need = len(rare)
+        else:
+            need = max(1, (len(rare) + 1) // 2)
+
+        # 2. Candidates sharing at least `need` of the query's rare bigrams (tolerates typos).
+        # Any such name is in one of the len(rare) - need + 1 smallest buckets; at most
+        # MAX_CANDIDATES of them are looked at, smallest buckets first.
+        candidates = {}
+        for bucket in rare[:len(rare) - need + 1]:
+            for n in islice(bucket, MAX_CANDIDATES - len(candidates)):
+                if n not in seen:
+                    candidates[n] = None
+            if len(candidates) >= MAX_CANDIDATES:
+                break
+
+        ranked = []
+        for n in candidates:
+            count = sum(1 for b in rare if n in b)
+            if count < need:
+                continue
+            low = self._lower[n]
+            pos = low.find(q)
+            if pos >= 0:
+                ranked.append((0, pos, 0, len(low), n))
+            else:
+                gaps = _subsequence_gaps(q, low)
+                if gaps is not None:
+                    ranked.append((1, gaps, -count, len(low), n))
+                else:
+                    ranked.append((2, -count, 0, len(low), n))
+        results.extend(r[-1] for r in heapq.nsmallest(limit - len(results), ranked))
+        return results
+
+    def _scan(self, q, results, seen, limit):
+        """Append names containing q in alphabetical order, looking at MAX_CANDIDATES names at most. True once full."""
+        for low, n in islice(self._prefix, MAX_CANDIDATES):
+            if n not in seen and q in low:
+                results.append(n)
+                seen.add(n)
+                if len(results) >= limit:
+                    return True
+        return False
@@ -0,0 +1,96 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from .metrics import meter
+from .diagnostics import diag
+
+DEFAULT_SECONDS = 30
+SAMPLE_INTERVAL = 0.005  # 200 Hz
+TRACEMALLOC_FRAMES = 16
+
+
+class ProfilerCapture:
+    """
+    On-demand sampling profiler for the running process.
+    While a capture runs, a background thread snapshots every thread's stack at a fixed
+    interval and tracemalloc records allocations. Nothing is installed when idle, so a
+    disabled profiler costs nothing.
+
+    Output (in output_dir):
+      profile-<timestamp>.folded      collapsed stacks, one "thread;frame;...;frame count" per line
+                                      (flamegraph.pl / speedscope compatible)
+      profile-<timestamp>.tracemalloc tracemalloc snapshot (tracemalloc.Snapshot.load)
+    """
+    def __init__(self, output_dir, on_finished=None):
+        self.output_dir = output_dir
+        self.on_finished = on_finished
+        self._lock = threading.Lock()
+        self._stop = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds=DEFAULT_SECONDS):
+        """Start a capture of `seconds` length. Returns the output path prefix, or None if already running."""
+        with self._lock:
+            if self.running:
+                return None
+            base = os.path.join(self.output_dir, time.strftime("profile-%Y%m%d-%H%M%S"))
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._worker, args=(float(seconds), base, self._stop), daemon=True, name="NVFT-profiler")
+            self._thread.start()
+            return base
+
+    def stop(self):
+        """End the current capture early; results are still written."""
+        with self._lock:
+            if self._stop:
+                self._stop.set()
+
+    def _worker(self, seconds, base, stop):
+        own_id = threading.get_ident()
+        samples = Counter()
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+        deadline = time.monotonic() + seconds
+        try:
+            while not stop.is_set() and time.monotonic() < deadline:
+                meter.wakeup("profiler")
+                names = {t.ident: t.name for t in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_id:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                        frame = frame.f_back
+                    stack.append(names.get(thread_id, str(thread_id)))
+                    samples[";".join(reversed(stack))] += 1
+                stop.wait(SAMPLE_INTERVAL)
+
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            if started_tracemalloc:
+                tracemalloc.stop()
+
+        try:
+            with open(base + ".folded", "w", encoding="utf-8") as f:
+                for stack, count in samples.most_common():
+                    f.write(f"{stack} {count}\n")
+            snapshot.dump(base + ".tracemalloc")
+        except Exception as e:
+            diag.error("profiler", "Error writing profile", error=e)
+
+        with self._lock:
+            self._thread = None
+            self._stop = None
+        if self.on_finished:
+            self.on_finished(base)
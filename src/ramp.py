@@ -0,0 +1,166 @@
+import math
+from ctypes import Structure, byref, c_ushort, memmove, sizeof
+from .colortemp import NEUTRAL_KELVIN, temperature_scales
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: without numpy the pure-Python kernel is used
+    np = None
+
+RAMP_SIZE = 256
+
+# Windows GDI gamma ramp layout (3 x 256 WORDs)
+class RAMP(Structure):
+    _fields_ = [("Red", c_ushort * 256), ("Green", c_ushort * 256), ("Blue", c_ushort * 256)]
+
+
+def ramp_params(settings):
+    """
+    Extract the ramp model parameters from a settings dict.
+    Returns (inv_gamma, brightness_offset, contrast_gain, r_scale, g_scale, b_scale).
+    In "temperature" color mode the channel scales come from the white-point table instead.
+    """
+    b_input = float(settings.get("brightness", 0.53))
+    c_input = float(settings.get("contrast", 0.85))
+    gamma_val = max(0.1, float(settings.get("gamma", 2.4)))
+    r_scale = float(settings.get("red_scale", 1.0))
+    g_scale = float(settings.get("green_scale", 1.0))
+    b_scale = float(settings.get("blue_scale", 1.0))
+    if settings.get("color_mode") == "temperature":
+        r_scale, g_scale, b_scale = temperature_scales(float(settings.get("temperature", NEUTRAL_KELVIN)))
+    return (1.0 / gamma_val, b_input - 0.5, c_input * 2.0, r_scale, g_scale, b_scale)
+
+
+def ramp_table(settings):
+    """
+    RAMP filled from a stored ramp ("custom_ramp": 3 lists of 256 16-bit values, e.g. an
+    imported LUT), or None if there is none or it is malformed.
+    """
+    table = settings.get("custom_ramp")
+    if not table:
+        return None
+    ramp = RAMP()
+    try:
+        # Hand-edited settings can hold anything here: every check is inside the try
+        if len(table) != 3:
+            return None
+        for channel, values in zip((ramp.Red, ramp.Green, ramp.Blue), table):
+            if len(values) != RAMP_SIZE:
+                return None
+            channel[:] = [max(0, min(65535, int(v))) for v in values]
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return ramp
+
+
+def sample_curves(settings, samples=64):
+    """
+    Sample the R/G/B output curves at evenly spaced inputs, normalized to 0..1.
+    Cheap enough to run on every slider tick for the preview graph.
+    settings: a SettingsSnapshot (its validated table / params are used) or a plain dict.
+    """
+    if hasattr(settings, "ramp_version"):
+        table, params = settings.table, settings.ramp
+    else:
+        table = ramp_table(settings)
+        params = None if table is not None else ramp_params(settings)
+    if table is not None:
+        last = samples - 1
+        idx = [round(i * (RAMP_SIZE - 1) / last) for i in range(samples)]
+        return tuple([values[j] / 65535 for j in idx] for values in (table.Red, table.Green, table.Blue))
+
+    inv_gamma, offset, gain, r_scale, g_scale, b_scale = params
+    red, green, blue = [], [], []
+    last = samples - 1
+    for i in range(samples):
+        val = math.pow(i / last, inv_gamma)
+        val = (val + offset - 0.5) * gain + 0.5
+        val = max(0.0, min(1.0, val))
+        red.append(min(1.0, val * r_scale))
+        green.append(min(1.0, val * g_scale))
+        blue.append(min(1.0, val * b_scale))
+    return red, green, blue
+
+
+def fill_ramp_python(params, ramp):
+    """Reference kernel: fill a RAMP structure one entry at a time."""
+    inv_gamma, offset, gain, r_scale, g_scale, b_scale = params
+    for i in range(RAMP_SIZE):
+        val = math.pow(i / 255.0, inv_gamma)
+        val = (val + offset - 0.5) * gain + 0.5
+        val = max(0.0, min(1.0, val)) * 65535
+
+        ramp.Red[i] = int(max(0, min(65535, val * r_scale)))
+        ramp.Green[i] = int(max(0, min(65535, val * g_scale)))
+        ramp.Blue[i] = int(max(0, min(65535, val * b_scale)))
+
+
+def ramp_view(ramp):
+    """(3, 256) uint16 numpy view sharing memory with a RAMP structure (buffer protocol, no copy)."""
+    return np.frombuffer(ramp, dtype=np.uint16).reshape(3, RAMP_SIZE)
+
+
+class RampKernel:
+    """
+    Vectorized kernel: computes all three channels in one pass with preallocated scratch arrays.
+    Produces exactly the same values as fill_ramp_python (same operation order, truncating cast).
+    """
+    def __init__(self):
+        self._levels = np.arange(RAMP_SIZE, dtype=np.float64) / 255.0
+        self._base = np.empty(RAMP_SIZE, dtype=np.float64)
+        self._scales = np.empty((3, 1), dtype=np.float64)
+        self._channels = np.empty((3, RAMP_SIZE), dtype=np.float64)
+
+    def fill(self, params, view):
+        inv_gamma, offset, gain, r_scale, g_scale, b_scale = params
+        base = self._base
+        np.power(self._levels, inv_gamma, out=base)
+        base += offset
+        base -= 0.5
+        base *= gain
+        base += 0.5
+        np.clip(base, 0.0, 1.0, out=base)
+        base *= 65535
+
+        self._scales[0, 0] = r_scale
+        self._scales[1, 0] = g_scale
+        self._scales[2, 0] = b_scale
+        channels = self._channels
+        np.multiply(base, self._scales, out=channels)
+        np.clip(channels, 0, 65535, out=channels)
+        np.copyto(view, channels, casting="unsafe")
+
+
+class RampBuffers:
+    """
+    Two preallocated RAMP structures used as front/back buffers.
+    The ramp is computed into the back buffer, which is passed to SetDeviceGammaRamp as-is;
+    swap() makes it the front (on-screen) buffer once the upload succeeded.
+    """
+    def __init__(self):
+        self._ramps = (RAMP(), RAMP())
+        self._views = (ramp_view(self._ramps[0]), ramp_view(self._ramps[1])) if np is not None else None
+        self._kernel = RampKernel() if np is not None else None
+        self._back = 0
+
+    @property
+    def front(self):
+        return self._ramps[self._back ^ 1]
+
+    def compute(self, params):
+        """Fill the back buffer for the given ramp_params() and return it."""
+        if self._kernel is not None:
+            self._kernel.fill(params, self._views[self._back])
+        else:
+            fill_ramp_python(params, self._ramps[self._back])
+        return self._ramps[self._back]
+
+    def load(self, table):
+        """Copy a ready-made RAMP (see ramp_table) into the back buffer and return it."""
+        back = self._ramps[self._back]
+        memmove(byref(back), byref(table), sizeof(RAMP))
+        return back
+
+    def swap(self):
+        self._back ^= 1
@@ -0,0 +1,169 @@
+"""
+Offline preset preview renderer.
+
+Applies presets' ramps to screenshots through a precomputed Pillow point-LUT and writes
+side-by-side comparison sheets (and optionally the individual renders), without touching
+the display.
+
+    python -m src.render shots/*.png --preset Night --preset Dusk --out previews
+    python -m src.render shots/ --all --workers 8 --mode both
+
+Images are processed by a worker pool with a bounded number in flight, so arbitrarily
+large batches stream through without being held in memory.
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import re
+import sys
+
+from PIL import Image, ImageDraw
+
+from .ramp import RAMP, fill_ramp_python, ramp_params, ramp_table
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+SHEET_THUMB_WIDTH = 640
+LABEL_HEIGHT = 24
+
+
+def default_presets_file():
+    return os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "NVFT", "presets.json")
+
+
+def preset_lut(preset):
+    """768-entry (R, G, B) 8-bit point table for a preset's ramp (stored or computed)."""
+    ramp = ramp_table(preset)
+    if ramp is None:
+        ramp = RAMP()
+        fill_ramp_python(ramp_params(preset), ramp)
+    lut = []
+    for channel in (ramp.Red, ramp.Green, ramp.Blue):
+        lut.extend((v * 255 + 32767) // 65535 for v in channel)
+    return lut
+
+
+def iter_images(paths):
+    """Expand files and directories lazily, in a stable order."""
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def _safe_name(name):
+    return re.sub(r'[<>:"/\\|?*\s]+', "_", name).strip("_") or "preset"
+
+
+# --- Worker side (module-level so it can run in a process pool) ---
+
+_worker_luts = None
+
+
+def _init_worker(luts):
+    global _worker_luts
+    _worker_luts = luts
+
+
+def _label(image, text):
+    labelled = Image.new("RGB", (image.width, image.height + LABEL_HEIGHT), (18, 19, 26))
+    labelled.paste(image, (0, LABEL_HEIGHT))
+    ImageDraw.Draw(labelled).text((6, 5), text, fill=(255, 255, 255))
+    return labelled
+
+
+def render_one(path, out_dir, mode, thumb_width=SHEET_THUMB_WIDTH):
+    """Render one image with every preset. Returns the list of files written."""
+    written = []
+    stem = os.path.splitext(os.path.basename(path))[0]
+    with Image.open(path) as source:
+        image = source.convert("RGB")
+
+    tiles = []
+    if mode in ("sheet", "both"):
+        scale = min(1.0, thumb_width / image.width)
+        thumb_size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+        original = image.resize(thumb_size) if scale < 1.0 else image
+        tiles.append(_label(original, "Original"))
+
+    for name, lut in _worker_luts:
+        rendered = image.point(lut)
+        if mode in ("images", "both"):
+            target = os.path.join(out_dir, f"{stem}__{_safe_name(name)}.png")
+            rendered.save(target)
+            written.append(target)
+        if tiles:
+            # Scaling the original thumbnail through the LUT is equivalent and much cheaper
+            tiles.append(_label(original.point(lut), name))
+
+    if tiles:
+        sheet = Image.new("RGB", (sum(t.width for t in tiles), max(t.height for t in tiles)), (5, 5, 9))
+        x = 0
+        for tile in tiles:
+            sheet.paste(tile, (x, 0))
+            x += tile.width
+        target = os.path.join(out_dir, f"{stem}__sheet.png")
+        sheet.save(target)
+        written.append(target)
+    return written
+
+
+def render_batch(paths, presets, out_dir, mode="sheet", workers=None):
+    """
+    Render images with the given {name: preset} through a process pool.
+    Yields (path, written files or exception) as images complete.
+    """
+    luts = [(name, preset_lut(data)) for name, data in presets.items()]
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(luts,)) as pool:
+        pending = {}
+        for path in iter_images(paths):
+            pending[pool.submit(render_one, path, out_dir, mode)] = path
+            if len(pending) >= max_in_flight:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.exception() or future.result()
+        for future in concurrent.futures.as_completed(pending):
+            yield pending[future], future.exception() or future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render NVFT presets onto screenshots.")
+    parser.add_argument("images", nargs="+", help="Image files or directories")
+    parser.add_argument("--presets", default=default_presets_file(), help="presets.json to read")
+    parser.add_argument("--preset", action="append", default=[], help="Preset to render (repeatable)")
+    parser.add_argument("--all", action="store_true", help="Render every preset in the file")
+    parser.add_argument("--out", default="nvft-previews", help="Output directory")
+    parser.add_argument("--mode", choices=("sheet", "images", "both"), default="sheet")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.presets, "r") as f:
+        library = json.load(f)
+
+    names = sorted(library) if args.all else args.preset
+    if not names:
+        parser.error("choose presets with --preset NAME or --all")
+    missing = [n for n in names if n not in library]
+    if missing:
+        parser.error(f"unknown preset(s): {', '.join(missing)}")
+    presets = {n: library[n] for n in names}
+
+    failures = 0
+    for path, result in render_batch(args.images, presets, args.out, args.mode, args.workers):
+        if isinstance(result, Exception):
+            failures += 1
+            print(f"{path}: {result}")
+        else:
+            print(f"{path}: {len(result)} file(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Time-of-day preset scheduler.
+
+The "schedule" setting lists daily start times, e.g.
+    [{"start": "20:00", "preset": "Dusk"}, {"start": "22:00", "preset": "Night"}]
+and each preset stays active until the next entry starts (wrapping around midnight).
+
+Upcoming transitions live in a heap; a single thread sleeps until the earliest one, with
+no periodic polling. Wall-clock jumps (manual changes, DST, time zone) and resume from
+sleep are handled by rebuilding the heap: recheck() is called by the Windows time/power
+notifications (see time_events), and a clock that moved backwards is detected on wakeup.
+Transition times are naive local times, but the wait until the next one is measured in
+aware local time, so a DST change in between does not make it fire an hour early or late
+even if no time change notification arrives.
+The clock is injectable so the scheduler can be driven in virtual time.
+"""
+import datetime
+import heapq
+import threading
+from .diagnostics import diag
+from .metrics import meter
+
+# A wakeup this far past the transition it waited for means the wall clock jumped (or we slept)
+JUMP_TOLERANCE = 2.0
+
+
+class SystemClock:
+    def now(self):
+        return datetime.datetime.now()
+
+    def wait(self, event, timeout):
+        """Block until event is set or timeout (seconds, None = forever) elapsed."""
+        return event.wait(timeout)
+
+
+def parse_schedule(entries):
+    """[(datetime.time, preset name)] sorted by start time; invalid entries are skipped."""
+    parsed = []
+    for entry in entries or ():
+        try:
+            hours, minutes = str(entry["start"]).split(":")
+            start = datetime.time(int(hours), int(minutes))
+            preset = entry["preset"]
+            if not isinstance(preset, str) or not preset:
+                raise ValueError("missing preset name")
+        except (KeyError, TypeError, ValueError) as e:
+            diag.warning("scheduler", "Invalid schedule entry skipped", entry=entry, error=e)
+            continue
+        parsed.append((start, preset))
+    parsed.sort()
+    return parsed
+
+
+def _occurrence(day, start):
+    return datetime.datetime.combine(day, start)
+
+
+def _seconds_between(earlier, later):
+    """Elapsed seconds between two naive local times; astimezone() resolves each one's UTC offset."""
+    return (later.astimezone() - earlier.astimezone()).total_seconds()
+
+
+class Scheduler:
+    def __init__(self, apply_preset, clock=None):
+        # apply_preset(name) is called on the scheduler thread (main passes app.external_load_preset)
+        self.apply_preset = apply_preset
+        self.clock = clock or SystemClock()
+        self.current = None  # Preset the schedule applied last
+        self._entries = []
+        self._heap = []  # (when, index) of the next occurrence of each entry
+        self._rebuild = True
+        self._last_now = None
+        self._stopped = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def set_schedule(self, entries):
+        entries = parse_schedule(entries)
+        with self._lock:
+            self._entries = entries
+            self._rebuild = True
+        self._wake.set()
+
+    def recheck(self):
+        """The wall clock changed or the system resumed: re-evaluate against the current time."""
+        with self._lock:
+            self._rebuild = True
+        self._wake.set()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._worker, daemon=True, name="NVFT-scheduler")
+        self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def active_entry(self, now):
+        """Preset whose window contains `now` (the last start at or before it, else yesterday's last)."""
+        current = None
+        for start, preset in self._entries:
+            if start <= now.time():
+                current = preset
+        if current is None and self._entries:
+            current = self._entries[-1][1]
+        return current
+
+    def _build(self, now):
+        self._heap = []
+        for index, (start, _) in enumerate(self._entries):
+            when = _occurrence(now.date(), start)
+            if when <= now:
+                when = _occurrence(now.date() + datetime.timedelta(days=1), start)
+            self._heap.append((when, index))
+        heapq.heapify(self._heap)
+        self._rebuild = False
+        return self.active_entry(now)
+
+    def step(self, now):
+        """
+        Advance the schedule to `now`. Returns (preset to apply or None, seconds until the
+        next transition or None if the schedule is empty).
+        """
+        with self._lock:
+            due = None
+            rebuilt = False
+            if self._rebuild or (self._last_now is not None and now < self._last_now):
+                # Clock moved backwards (or the schedule changed): start over from now
+                due, rebuilt = self._build(now), True
+            else:
+                while self._heap and self._heap[0][0] <= now:
+                    when, index = heapq.heappop(self._heap)
+                    if _seconds_between(when, now) > JUMP_TOLERANCE:
+                        # Overslept (resume, clock set forward): whatever is active now wins
+                        due, rebuilt = self._build(now), True
+                        break
+                    due = self._entries[index][1]
+                    heapq.heappush(self._heap, (when + datetime.timedelta(days=1), index))
+            self._last_now = now
+            timeout = _seconds_between(now, self._heap[0][0]) if self._heap else None
+
+        # A re-evaluation only re-applies if the active window changed, so a preset picked by
+        # hand is kept; a regular transition always applies
+        if rebuilt and due == self.current:
+            due = None
+        return due, timeout
+
+    def _worker(self):
+        while not self._stopped:
+            # Cleared before reading the state, so a set_schedule/recheck in between is never lost
+            self._wake.clear()
+            due, timeout = self.step(self.clock.now())
+            if due is not None:
+                self.current = due
+                diag.info("scheduler", "apply", preset=due)
+                try:
+                    self.apply_preset(due)
+                except Exception as e:
+                    diag.error("scheduler", "Failed to apply scheduled preset", preset=due, error=e)
+            self.clock.wait(self._wake, None if timeout is None else max(0.0, timeout))
+            meter.wakeup("scheduler")
@@ -0,0 +1,83 @@
+import threading
+import concurrent.futures
+from .diagnostics import diag
+
+
+class StartupGraph:
+    """
+    Runs startup steps on a small thread pool, each one as soon as its dependencies finished.
+    A step whose dependency failed fails with the same exception instead of running.
+    """
+    def __init__(self, max_workers=4):
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="NVFT-startup")
+        self._futures = {}
+
+    def add(self, name, func, deps=()):
+        future = concurrent.futures.Future()
+        self._futures[name] = future
+        pending = [self._futures[d] for d in deps]
+        remaining = [len(pending)]
+        lock = threading.Lock()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                diag.error("startup", "Startup step failed", step=name, error=e)
+                future.set_exception(e)
+
+        def dep_done(dep):
+            with lock:
+                remaining[0] -= 1
+                ready = remaining[0] == 0
+            if not ready:
+                return
+            for d in pending:
+                if d.exception() is not None:
+                    future.set_exception(d.exception())
+                    return
+            self._pool.submit(run)
+
+        if not pending:
+            self._pool.submit(run)
+        for d in pending:
+            d.add_done_callback(dep_done)
+        return future
+
+    def result(self, name):
+        """Block until a step finished and return its result (re-raises its exception)."""
+        return self._futures[name].result()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+class Deferred:
+    """
+    Stand-in for an object that is still being constructed (e.g. the Tk app while hotkeys
+    and the tray are already live). Calls are queued and replayed in order on bind().
+    """
+    def __init__(self):
+        self._target = None
+        self._queue = []
+        self._lock = threading.Lock()
+
+    def call(self, method, *args):
+        with self._lock:
+            if self._target is None:
+                self._queue.append((method, args))
+                return None
+            target = self._target
+        return getattr(target, method)(*args)
+
+    def method(self, name):
+        return lambda *args: self.call(name, *args)
+
+    def bind(self, target):
+        with self._lock:
+            self._target = target
+            queued, self._queue = self._queue, []
+        for method, args in queued:
+            getattr(target, method)(*args)
@@ -0,0 +1,94 @@
+import ctypes
+import threading
+from ctypes import windll, wintypes
+from .metrics import meter
+from .diagnostics import diag
+
+# Broadcast messages only reach top-level windows, so this uses a hidden one
+# (a message-only HWND_MESSAGE window would not receive them)
+WM_TIMECHANGE = 0x001E
+WM_POWERBROADCAST = 0x0218
+PBT_APMRESUMESUSPEND = 0x0007
+PBT_APMRESUMEAUTOMATIC = 0x0012
+
+LRESULT = ctypes.c_ssize_t
+WNDPROC = ctypes.WINFUNCTYPE(LRESULT, wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+
+
+class WNDCLASSW(ctypes.Structure):
+    _fields_ = [
+        ("style", wintypes.UINT),
+        ("lpfnWndProc", WNDPROC),
+        ("cbClsExtra", ctypes.c_int),
+        ("cbWndExtra", ctypes.c_int),
+        ("hInstance", wintypes.HINSTANCE),
+        ("hIcon", wintypes.HICON),
+        ("hCursor", wintypes.HANDLE),
+        ("hbrBackground", wintypes.HBRUSH),
+        ("lpszMenuName", wintypes.LPCWSTR),
+        ("lpszClassName", wintypes.LPCWSTR),
+    ]
+
+
+user32 = windll.user32
+kernel32 = windll.kernel32
+user32.DefWindowProcW.argtypes = [wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+user32.DefWindowProcW.restype = LRESULT
+user32.RegisterClassW.argtypes = [ctypes.POINTER(WNDCLASSW)]
+user32.RegisterClassW.restype = wintypes.ATOM
+user32.CreateWindowExW.argtypes = [
+    wintypes.DWORD, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+    ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+    wintypes.HWND, wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID
+]
+user32.CreateWindowExW.restype = wintypes.HWND
+user32.GetMessageW.argtypes = [ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT]
+user32.GetMessageW.restype = wintypes.BOOL
+user32.DispatchMessageW.argtypes = [ctypes.POINTER(wintypes.MSG)]
+kernel32.GetModuleHandleW.argtypes = [wintypes.LPCWSTR]
+kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+
+class TimeChangeListener:
+    """
+    Calls on_change when the system clock is set (manually, by time sync, DST or a time zone
+    change) or the machine resumes from sleep. The thread blocks in GetMessageW and only
+    wakes for messages sent to its hidden window.
+    """
+    def __init__(self, on_change):
+        self.on_change = on_change
+        self._thread = None
+        # Kept referenced: the window procedure must outlive the window
+        self._wndproc = WNDPROC(self._handle)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._worker, daemon=True, name="NVFT-scheduler-events")
+        self._thread.start()
+
+    def _handle(self, hwnd, msg, wparam, lparam):
+        if msg == WM_TIMECHANGE or (msg == WM_POWERBROADCAST and wparam in (PBT_APMRESUMEAUTOMATIC, PBT_APMRESUMESUSPEND)):
+            meter.wakeup("scheduler")
+            try:
+                self.on_change()
+            except Exception as e:
+                diag.error("scheduler", "Time change handler error", error=e)
+        return user32.DefWindowProcW(hwnd, msg, wparam, lparam)
+
+    def _worker(self):
+        # The window must be created on the thread that pumps its messages
+        instance = kernel32.GetModuleHandleW(None)
+        wc = WNDCLASSW()
+        wc.lpfnWndProc = self._wndproc
+        wc.hInstance = instance
+        wc.lpszClassName = "NVFTTimeEvents"
+        if not user32.RegisterClassW(ctypes.byref(wc)):
+            diag.warning("scheduler", "Time change notifications unavailable (RegisterClass failed)")
+            return
+        hwnd = user32.CreateWindowExW(0, wc.lpszClassName, "NVFT time events", 0, 0, 0, 0, 0, None, None, instance, None)
+        if not hwnd:
+            diag.warning("scheduler", "Time change notifications unavailable (CreateWindow failed)")
+            return
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.DispatchMessageW(ctypes.byref(msg))
@@ -0,0 +1,25 @@
+import pytest
+
+from src.debounce import DEFAULT_WINDOW_MS, Debouncer
+
+
+@pytest.mark.parametrize("value, window", [(40, 0.04), ("25", 0.025), (-5, 0.0), (None, DEFAULT_WINDOW_MS / 1000.0)])
+def test_configure(value, window):
+    debouncer = Debouncer()
+    debouncer.configure(value)
+    assert debouncer.window == window
+
+
+@pytest.mark.parametrize("value", ["fast", [150], "inf", "nan", {}])
+def test_configure_invalid_keeps_default(value):
+    debouncer = Debouncer(window_ms=10)
+    debouncer.configure(value)
+    assert debouncer.window == DEFAULT_WINDOW_MS / 1000.0
+
+
+def test_allow_drops_repeats_within_window():
+    debouncer = Debouncer(window_ms=10000)
+    assert debouncer.allow("toggle", "keyboard")
+    assert not debouncer.allow("toggle", "ipc")
+    assert debouncer.allow("preset:Night", "ipc")
+    assert debouncer.counts() == {"ipc.debounce": 1}
@@ -0,0 +1,38 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+# src.ipc pulls in src.config, which needs the Windows registry module
+pytest.importorskip("winreg")
+
+from src.ipc import ProtocolError, execute_commands, parse_request
+
+
+class _App:
+    def __init__(self, presets=("Night",), playlist=(), profiler=None):
+        self.calls = []
+        self.config = SimpleNamespace(presets={name: {} for name in presets}, playlist=lambda: list(playlist))
+        self.gamma = SimpleNamespace(active=False)
+        self.profiler = profiler
+
+    def __getattr__(self, name):
+        # Any state-changing call is recorded instead of run
+        return lambda *args, **kwargs: self.calls.append(name)
+
+
+def _commands(*commands):
+    return parse_request(json.dumps({"cmd": "batch", "commands": list(commands)}).encode())[1]
+
+
+@pytest.mark.parametrize("failing, message", [
+    ({"cmd": "load-preset", "name": "Missing"}, "unknown preset"),
+    ({"cmd": "next"}, "playlist is empty"),
+    ({"cmd": "profile"}, "profiler unavailable"),
+])
+def test_failing_batch_changes_nothing(failing, message):
+    app = _App()
+    commands = _commands({"cmd": "load-preset", "name": "Night"}, {"cmd": "on"}, failing)
+    with pytest.raises(ProtocolError, match=message):
+        execute_commands(app, commands)
+    assert app.calls == []
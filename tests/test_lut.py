@@ -0,0 +1,67 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.lut import LutError, import_lut, parse_cube, reduce_lut
+
+
+def _write(tmp_path, text, name="test.cube"):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def _identity_1d(size, lo=0.0, hi=1.0):
+    return "".join(f"{v} {v} {v}\n" for v in np.linspace(lo, hi, size))
+
+
+def _identity_3d(size, lo=0.0, hi=1.0):
+    grid = np.linspace(lo, hi, size)
+    return "".join(f"{grid[r]} {grid[g]} {grid[b]}\n" for b in range(size) for g in range(size) for r in range(size))
+
+
+def test_identity_3d(tmp_path):
+    curves, rms, peak = reduce_lut(parse_cube(_write(tmp_path, "LUT_3D_SIZE 5\n" + _identity_3d(5))))
+    assert np.allclose(curves, np.linspace(0, 1, 256)[None, :], atol=1e-9)
+    assert rms < 1e-9 and peak < 1e-9
+
+
+def test_1d_input_range(tmp_path):
+    # Input 0..2 mapped to output 0..1: a level of x reads the table at x, giving x / 2
+    text = "LUT_1D_SIZE 3\nLUT_1D_INPUT_RANGE 0.0 2.0\n0 0 0\n0.5 0.5 0.5\n1 1 1\n"
+    lut = parse_cube(_write(tmp_path, text))
+    assert list(lut.domain_max) == [2.0, 2.0, 2.0]
+    curves, _, _ = reduce_lut(lut)
+    assert np.allclose(curves[:, 255], 0.5)
+
+
+def test_3d_input_range(tmp_path):
+    text = "LUT_3D_SIZE 3\nLUT_3D_INPUT_RANGE 0.0 2.0\n" + _identity_3d(3, 0.0, 2.0)
+    curves, _, _ = reduce_lut(parse_cube(_write(tmp_path, text)))
+    # Identity over 0..2, sampled at 0..1 and clipped
+    assert np.allclose(curves, np.linspace(0, 1, 256)[None, :], atol=1e-9)
+
+
+def test_shaper_uses_1d_range_and_cube_its_own(tmp_path):
+    # Shaper maps 0..4 onto 0..2, the cube is identity over 0..2
+    text = ("LUT_1D_SIZE 2\nLUT_3D_SIZE 3\nLUT_1D_INPUT_RANGE 0 4\nLUT_3D_INPUT_RANGE 0 2\n"
+            + _identity_1d(2, 0.0, 2.0) + _identity_3d(3, 0.0, 2.0))
+    lut = parse_cube(_write(tmp_path, text))
+    assert list(lut.domain_max) == [4.0] * 3 and list(lut.cube_max) == [2.0] * 3
+    curves, _, _ = reduce_lut(lut)
+    assert np.allclose(curves[:, 255], 0.5)
+
+
+def test_unknown_keyword_is_reported(tmp_path):
+    with pytest.raises(LutError, match="LUT_IN_VIDEO_RANGE"):
+        parse_cube(_write(tmp_path, "LUT_3D_SIZE 2\nLUT_IN_VIDEO_RANGE\n" + _identity_3d(2)))
+
+
+def test_conflicting_ranges_are_reported(tmp_path):
+    with pytest.raises(LutError):
+        parse_cube(_write(tmp_path, "LUT_3D_SIZE 2\nDOMAIN_MAX 2 2 2\nLUT_3D_INPUT_RANGE 0 2\n" + _identity_3d(2)))
+
+
+def test_import_lut_ramp(tmp_path):
+    ramp, rms, peak = import_lut(_write(tmp_path, "LUT_1D_SIZE 2\n0 0 0\n1 1 1\n"))
+    assert len(ramp) == 3 and ramp[0][0] == 0 and ramp[0][255] == 65535
@@ -0,0 +1,45 @@
+import time
+
+from src.preset_index import PresetIndex
+
+
+def _library(count=60000):
+    words = ["night", "dark", "red", "warm", "custom", "preset", "three", "evening", "film"]
+    return [f"{words[i % 9]} {words[i // 9 % 9]} {i}" for i in range(count)]
+
+
+def test_prefix_then_fuzzy():
+    index = PresetIndex(["Night", "Nightly", "Dark Night", "Custom"])
+    assert index.search("nig", 2) == ["Night", "Nightly"]
+    assert "Dark Night" in index.search("nigt")
+    assert index.search("cstm") == ["Custom"]
+
+
+def test_single_character_matches_substrings():
+    index = PresetIndex(["Alpha", "Bravo", "Charlie", "Delta"])
+    assert index.search("e") == ["Charlie", "Delta"]
+    assert index.search("q") == []
+
+
+def test_single_rare_character_beyond_the_scan_cap():
+    index = PresetIndex([f"preset {i:05d}" for i in range(5000)] + ["zz quartz"])
+    assert index.search("q") == ["zz quartz"]
+
+
+def test_incremental_updates():
+    index = PresetIndex(["Night"])
+    index.add("Day")
+    index.rename("Night", "Evening")
+    assert index.search("even") == ["Evening"]
+    index.remove("Day")
+    assert index.names() == ["Evening"]
+
+
+def test_typo_search_is_bounded():
+    index = PresetIndex(_library())
+    index.search("nigt")
+    for query in ("nigt", "cstms", "re re", "drk wrm", "e"):
+        start = time.perf_counter()
+        assert index.search(query)
+        # Generous bound for slow CI machines; typically a few milliseconds
+        assert time.perf_counter() - start < 0.05, query
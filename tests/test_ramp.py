@@ -0,0 +1,85 @@
+import itertools
+import random
+
+import pytest
+
+from src.ramp import RAMP, RampBuffers, fill_ramp_python, ramp_params, ramp_table, sample_curves
+
+np = pytest.importorskip("numpy")
+
+
+def _python(settings):
+    ramp = RAMP()
+    fill_ramp_python(ramp_params(settings), ramp)
+    return bytes(ramp)
+
+
+def _vectorized(settings):
+    buffers = RampBuffers()
+    assert buffers._kernel is not None
+    return bytes(buffers.compute(ramp_params(settings)))
+
+
+def _settings(brightness, contrast, gamma, r, g, b):
+    return {"brightness": brightness, "contrast": contrast, "gamma": gamma,
+            "red_scale": r, "green_scale": g, "blue_scale": b}
+
+
+EDGE_CASES = [
+    # Brightness and contrast at both ends of their range
+    *(_settings(br, c, 1.0, 1.0, 1.0, 1.0) for br, c in itertools.product((0.0, 1.0), (0.0, 1.0))),
+    # Gamma floor: values below 0.1 are clamped to 0.1 by ramp_params
+    _settings(0.5, 0.5, 0.1, 1.0, 1.0, 1.0),
+    _settings(0.5, 0.5, 0.0, 1.0, 1.0, 1.0),
+    _settings(0.5, 0.5, 5.0, 1.0, 1.0, 1.0),
+    # Scales above 1 hit the 65535 clamp, 0 zeroes the channel
+    _settings(1.0, 1.0, 1.0, 2.0, 1.5, 0.0),
+    _settings(0.53, 0.85, 2.4, 2.0, 2.0, 2.0),
+]
+
+
+@pytest.mark.parametrize("settings", EDGE_CASES)
+def test_kernels_identical_on_edge_cases(settings):
+    assert _vectorized(settings) == _python(settings)
+
+
+def test_kernels_identical_on_random_settings():
+    rng = random.Random(1234)
+    for _ in range(500):
+        settings = _settings(rng.uniform(0.0, 1.0), rng.uniform(0.0, 1.0), rng.uniform(0.1, 5.0),
+                             rng.uniform(0.0, 2.0), rng.uniform(0.0, 2.0), rng.uniform(0.0, 2.0))
+        assert _vectorized(settings) == _python(settings), settings
+
+
+def test_kernels_identical_in_temperature_mode():
+    for kelvin in range(1700, 25001, 350):
+        settings = dict(_settings(0.5, 0.6, 1.8, 1.0, 1.0, 1.0), color_mode="temperature", temperature=kelvin)
+        assert _vectorized(settings) == _python(settings), kelvin
+
+
+def test_clamped_ends():
+    ramp = RAMP.from_buffer_copy(_vectorized(_settings(0.5, 1.0, 1.0, 2.0, 1.0, 0.0)))
+    assert ramp.Red[255] == 65535
+    assert max(ramp.Blue) == 0
+    assert ramp.Green[0] == 0
+
+
+@pytest.mark.parametrize("custom_ramp", [
+    5,
+    "abc",
+    [[0] * 256, [0] * 256],
+    [[0] * 256, [0] * 255, [0] * 256],
+    [[0] * 256, [0] * 256, ["x"] * 256],
+    [[0] * 256, [0] * 256, [float("nan")] * 256],
+    [[0] * 256, [0] * 256, [float("inf")] * 256],
+    [None, None, None],
+])
+def test_malformed_custom_ramp_falls_back(custom_ramp):
+    settings = dict(_settings(0.5, 0.5, 1.0, 1.0, 1.0, 1.0), custom_ramp=custom_ramp)
+    assert ramp_table(settings) is None
+    assert sample_curves(settings, 8) == sample_curves(_settings(0.5, 0.5, 1.0, 1.0, 1.0, 1.0), 8)
+
+
+def test_custom_ramp_is_used_and_clamped():
+    table = ramp_table({"custom_ramp": [[70000] * 256, [-1] * 256, list(range(256))]})
+    assert table.Red[0] == 65535 and table.Green[0] == 0 and table.Blue[255] == 255
@@ -0,0 +1,114 @@
+import datetime
+import time
+
+import pytest
+
+from src.scheduler import JUMP_TOLERANCE, Scheduler
+
+SCHEDULE = [
+    {"start": "07:00", "preset": "Day"},
+    {"start": "20:00", "preset": "Dusk"},
+    {"start": "22:00", "preset": "Night"},
+]
+
+
+def _at(hour, minute=0, second=0, day=1):
+    return datetime.datetime(2026, 6, day, hour, minute, second)
+
+
+def _scheduler(entries=SCHEDULE):
+    scheduler = Scheduler(lambda name: None)
+    scheduler.set_schedule(entries)
+    return scheduler
+
+
+def _step(scheduler, now):
+    # What the worker does with each step, minus the thread
+    due, timeout = scheduler.step(now)
+    if due is not None:
+        scheduler.current = due
+    return due, timeout
+
+
+def test_start_applies_active_entry():
+    scheduler = _scheduler()
+    assert _step(scheduler, _at(6)) == ("Night", 3600.0)
+    assert _step(scheduler, _at(12)) == ("Day", 8 * 3600.0)
+
+
+def test_transitions_through_a_day():
+    scheduler = _scheduler()
+    _step(scheduler, _at(6))
+    assert _step(scheduler, _at(7)) == ("Day", 13 * 3600.0)
+    assert _step(scheduler, _at(20)) == ("Dusk", 2 * 3600.0)
+    assert _step(scheduler, _at(22)) == ("Night", 9 * 3600.0)
+    assert _step(scheduler, _at(7, day=2)) == ("Day", 13 * 3600.0)
+
+
+def test_late_wakeup_within_tolerance_still_transitions():
+    scheduler = _scheduler()
+    _step(scheduler, _at(6))
+    due, timeout = _step(scheduler, _at(7, second=int(JUMP_TOLERANCE) - 1))
+    assert due == "Day"
+    assert timeout == 13 * 3600.0 - (JUMP_TOLERANCE - 1)
+
+
+def test_wraps_past_midnight_to_previous_days_last_entry():
+    scheduler = _scheduler([{"start": "20:00", "preset": "Dusk"}, {"start": "22:00", "preset": "Night"}])
+    assert _step(scheduler, _at(19)) == ("Night", 3600.0)
+    assert _step(scheduler, _at(20)) == ("Dusk", 2 * 3600.0)
+
+
+def test_clock_set_backwards_rebuilds():
+    scheduler = _scheduler()
+    _step(scheduler, _at(12))
+    assert _step(scheduler, _at(6)) == ("Night", 3600.0)
+    assert _step(scheduler, _at(7)) == ("Day", 13 * 3600.0)
+
+
+def test_clock_set_backwards_within_same_window_keeps_preset():
+    scheduler = _scheduler()
+    _step(scheduler, _at(12))
+    assert _step(scheduler, _at(9)) == (None, 11 * 3600.0)
+
+
+def test_oversleep_resumes_with_active_entry():
+    scheduler = _scheduler()
+    _step(scheduler, _at(12))
+    # Asleep through Dusk: the missed transition is not replayed, Night is active now
+    assert _step(scheduler, _at(23)) == ("Night", 8 * 3600.0)
+
+
+def test_recheck_keeps_a_manually_picked_preset():
+    scheduler = _scheduler()
+    _step(scheduler, _at(12))
+    scheduler.recheck()
+    assert _step(scheduler, _at(13)) == (None, 7 * 3600.0)
+    assert scheduler.current == "Day"
+
+
+def test_empty_schedule():
+    scheduler = _scheduler([])
+    assert _step(scheduler, _at(12)) == (None, None)
+    scheduler.set_schedule([{"start": "bad"}, {"preset": "Day"}])
+    assert _step(scheduler, _at(12)) == (None, None)
+
+
+@pytest.fixture
+def central_european_time(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available on this platform")
+    monkeypatch.setenv("TZ", "CET-1CEST,M3.5.0,M10.5.0/3")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_wait_across_dst_change_is_real_time(central_european_time):
+    scheduler = _scheduler([{"start": "07:00", "preset": "Day"}, {"start": "22:00", "preset": "Night"}])
+    # Clocks go forward 02:00 -> 03:00 on 2026-03-29: 7 wall-clock hours are 6 real ones
+    assert _step(scheduler, datetime.datetime(2026, 3, 29, 0)) == ("Night", 6 * 3600.0)
+    # ...and back 03:00 -> 02:00 on 2026-10-25: 7 wall-clock hours are 8 real ones
+    scheduler.recheck()
+    assert _step(scheduler, datetime.datetime(2026, 10, 25, 0)) == (None, 8 * 3600.0)